@@ -0,0 +1,113 @@
+"""Content pack reloads: editing one entry versus loading the pack again.
+
+Writes a pack of SIZE creatures and SIZE quests to a temp directory, once
+as a single file per collection and once split over SHARDS files each,
+loads an engine from it and builds its name indexes, then times:
+
+  full load     ContentPacks.load() plus a new engine and its indexes,
+                what restarting (or a naive reload) costs
+  edit creature rewrite one creature's line, then poll() and reload_entries()
+  edit quest    the same for a quest, which also re-indexes its quest rules
+
+    python benchmarks/bench_content_packs.py [sizes...] [--shards N] [--edits N]
+"""
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from content_packs import ContentPacks, write_pack_file
+from content_snapshot import load_content
+from engine import GameEngine
+from suite import make_world
+
+
+def write_pack(directory, collection, entries, shards):
+    os.makedirs(directory, exist_ok=True)
+    keys = list(entries)
+    per_shard = -(-len(keys) // shards)
+    for shard in range(shards):
+        part = {key: entries[key] for key in keys[shard * per_shard:(shard + 1) * per_shard]}
+        name = f"{collection}.jsonl" if shards == 1 else f"{collection}.{shard:04d}.jsonl"
+        write_pack_file(os.path.join(directory, name), part)
+
+
+def full_load(directory):
+    start = time.perf_counter()
+    packs = ContentPacks([directory])
+    engine = GameEngine.from_content(load_content()[0], packs=packs)
+    for collection in ("quests", "creatures"):
+        engine.match_index_for(getattr(engine, collection))
+        engine.name_index_for(collection)
+    return time.perf_counter() - start, packs, engine
+
+
+def edit_line(directory, key, text):
+    """Change the description of `key` in whichever pack file holds it"""
+    # At the start of a line, not in a quest's conditions
+    marker = f'\n["{key}", '.encode()
+    for name in os.listdir(directory):
+        path = os.path.join(directory, name)
+        with open(path, "rb") as f:
+            data = f.read()
+        start = data.find(marker) + 1
+        if not start:
+            continue
+        end = data.index(b"\n", start)
+        line = data[start:end]
+        before = line.index(b'"description": "') + len(b'"description": "')
+        after = line.index(b'"', before)
+        with open(path, "wb") as f:
+            f.write(data[:start] + line[:before] + text.encode() + line[after:] + data[end:])
+        return
+
+
+def time_edits(directory, packs, engine, collection, keys, edits):
+    """Seconds each of `edits` one-entry edits took to reload"""
+    entries = getattr(engine, collection)
+    times = []
+    for i in range(edits):
+        key = keys[(i * 7919) % len(keys)]
+        edit_line(directory, key, f"Edit number {i}.")
+        start = time.perf_counter()
+        changes = packs.poll(engine.content())
+        engine.reload_entries(changes)
+        times.append(time.perf_counter() - start)
+        assert [change[1] for change in changes] == [key], changes
+        assert entries[key]["description"] == f"Edit number {i}."
+    return times
+
+
+def run(size, shards, edits):
+    quests, creatures = make_world(size)[:2]
+    root = tempfile.mkdtemp(prefix="bench_content_packs_")
+    try:
+        for shard_count in (1, shards):
+            directory = os.path.join(root, f"pack_{shard_count}")
+            write_pack(directory, "creatures", creatures, shard_count)
+            write_pack(directory, "quests", quests, shard_count)
+            load_time, packs, engine = full_load(directory)
+            creature_times = time_edits(directory, packs, engine, "creatures", list(creatures), edits)
+            quest_times = time_edits(directory, packs, engine, "quests", list(quests), edits)
+            files = "1 file" if shard_count == 1 else f"{shard_count} files"
+            print(f"{size} of each in {files:<10} full load {load_time * 1000:9.1f} ms  "
+                  f"edit creature {statistics.median(creature_times) * 1000:8.2f} ms  "
+                  f"(max {max(creature_times) * 1000:.2f})  "
+                  f"edit quest {statistics.median(quest_times) * 1000:8.2f} ms  (max {max(quest_times) * 1000:.2f})")
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("sizes", nargs="*", type=int, default=[10_000, 100_000])
+    parser.add_argument("--shards", type=int, default=100, help="files to split the pack over for the second run")
+    parser.add_argument("--edits", type=int, default=20)
+    args = parser.parse_args()
+    for size in args.sizes:
+        run(size, args.shards, args.edits)
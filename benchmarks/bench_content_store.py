@@ -0,0 +1,103 @@
+"""Cold-start time and RSS: data/*.py style modules versus a content store.
+
+Generates a synthetic bestiary at each size, writes it both as a Python
+dict-literal module and as a content store file, then loads each one in a
+fresh interpreter and reports time and peak RSS. The module is loaded
+twice, since the first import also compiles it to a .pyc.
+
+    python benchmarks/bench_content_store.py [sizes...]
+"""
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+from content_store import write_store
+
+ART = "\n".join(["  /\\_/\\  ", " ( o.o ) ", "  > ^ <  ", " /     \\ ", "/  / \\  \\", "(_/   \\_)"] * 4)
+
+# ru_maxrss survives exec on Linux, so a child started from a big parent would
+# report the parent's peak. VmHWM is per process image.
+PEAK_RSS = """
+def peak_rss_kb():
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+"""
+
+LOAD_MODULE = PEAK_RSS + """
+import sys, time
+start = time.perf_counter()
+sys.path.insert(0, sys.argv[1])
+from synthetic_creatures import creatures
+names = [c["name"] for c in creatures.values()]
+print(time.perf_counter() - start, peak_rss_kb())
+"""
+
+LOAD_STORE = PEAK_RSS + """
+import sys, time
+start = time.perf_counter()
+sys.path.insert(0, sys.argv[2])
+from content_store import ContentStore
+creatures = ContentStore(sys.argv[1]).load("creatures")
+names = [c["name"] for c in creatures.values()]
+print(time.perf_counter() - start, peak_rss_kb())
+"""
+
+BASELINE = PEAK_RSS + """
+print(0.0, peak_rss_kb())
+"""
+
+
+def make_creatures(count):
+    return {
+        f"creature_{i}": {
+            "name": f"Creature {i}",
+            "description": f"Creature number {i}, a generated beast of no particular renown. " * 3,
+            "danger_level": ("low", "medium", "high")[i % 3],
+            "documented": False,
+            "ascii_art": ART,
+        }
+        for i in range(count)
+    }
+
+
+def measure(script, *args):
+    output = subprocess.run([sys.executable, "-c", script, *args], capture_output=True, text=True, check=True).stdout
+    seconds, rss_kb = output.split()
+    return float(seconds), int(rss_kb)
+
+
+def run(size, workdir):
+    creatures = make_creatures(size)
+    module_dir = os.path.join(workdir, str(size))
+    os.makedirs(module_dir, exist_ok=True)
+    with open(os.path.join(module_dir, "synthetic_creatures.py"), "w", encoding="utf-8") as f:
+        f.write(f"creatures = {creatures!r}\n")
+    store_path = os.path.join(workdir, f"{size}.msc")
+    write_store(store_path, {"creatures": creatures})
+
+    _, base_rss = measure(BASELINE)
+    compile_time, compile_rss = measure(LOAD_MODULE, module_dir)
+    module_time, module_rss = measure(LOAD_MODULE, module_dir)
+    store_time, store_rss = measure(LOAD_STORE, store_path, ROOT)
+    print(f"{size:>7} entries  "
+          f"module first import {compile_time * 1000:8.0f} ms  "
+          f"module cached {module_time * 1000:7.0f} ms / {(module_rss - base_rss) / 1024:6.1f} MB  "
+          f"store {store_time * 1000:7.0f} ms / {(store_rss - base_rss) / 1024:6.1f} MB")
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1_000, 50_000, 200_000]
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in sizes:
+            run(size, workdir)
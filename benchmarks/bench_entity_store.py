@@ -0,0 +1,104 @@
+"""Memory and query time: dicts per entry versus EntityTable columns.
+
+Generates SIZE creatures, quests and lore entries (suite.make_world, with
+danger levels and quest statuses spread out), measures the memory each
+representation holds (tracemalloc) and times the status queries the game
+makes: first undocumented creature, available quests, documented count,
+plus a single field read and write.
+
+    python benchmarks/bench_entity_store.py [sizes...]
+"""
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from entity_store import EntityTable
+from suite import make_world
+
+DANGER = ["low", "medium", "high", "extreme"]
+STATUS = ["available", "active", "completed", "locked"]
+
+
+def make_content(size, rng):
+    quests, creatures, lore, _ = make_world(size)
+    # Make the queries selective: few undocumented creatures and available quests
+    for i, creature in enumerate(creatures.values()):
+        creature["danger_level"] = rng.choice(DANGER)
+        creature["documented"] = i < size - 10
+    for i, quest in enumerate(quests.values()):
+        quest["status"] = "available" if i % 1000 == 999 else rng.choice(STATUS[1:])
+    return {"creatures": creatures, "quests": quests, "lore": lore}
+
+
+def traced(build):
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+
+def timed(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def run(size):
+    content, total_bytes = traced(lambda: make_content(size, random.Random(1)))
+    # The tables share the field values with the dicts they were built from,
+    # so compare what each adds on top of the values
+    dict_bytes = sum(sys.getsizeof(entries) + sum(sys.getsizeof(entry) for entry in entries.values())
+                     for entries in content.values())
+    values_bytes = total_bytes - dict_bytes
+    tables, table_bytes = traced(lambda: {name: EntityTable(entries) for name, entries in content.items()})
+    creatures, quests = content["creatures"], content["quests"]
+    creature_table, quest_table = tables["creatures"], tables["quests"]
+
+    sample = list(creatures)[size // 2]
+    queries = {
+        "first undocumented creature": (
+            lambda: next((key for key, c in creatures.items() if not c["documented"]), None),
+            lambda: creature_table.first("documented", False)),
+        "available quests": (
+            lambda: [key for key, q in quests.items() if q["status"] == "available"],
+            lambda: list(quest_table.where("status", "available"))),
+        "documented count": (
+            lambda: sum(1 for c in creatures.values() if c["documented"]),
+            lambda: creature_table.count("documented", True)),
+        "read a field": (
+            lambda: creatures[sample]["name"],
+            lambda: creature_table[sample]["name"]),
+    }
+    key = next(iter(creatures))
+    flip = [False]
+
+    def dict_write():
+        flip[0] = not flip[0]
+        creatures[key]["documented"] = flip[0]
+
+    def table_write():
+        flip[0] = not flip[0]
+        creature_table[key]["documented"] = flip[0]
+
+    queries["set documented"] = (dict_write, table_write)
+
+    print(f"{size} creatures, quests and lore entries")
+    print(f"  memory: dicts {dict_bytes / 1e6:6.1f} MB  tables {table_bytes / 1e6:6.1f} MB  "
+          f"(plus {values_bytes / 1e6:.1f} MB of field values in both)")
+    for name, (scan, table) in queries.items():
+        assert name.startswith("set") or scan() == table(), name
+        repeat = max(3, 200_000 // size)
+        scan_time, table_time = timed(scan, repeat), timed(table, repeat * 10)
+        print(f"  {name:<28} dicts {scan_time * 1e6:10.2f} us  table {table_time * 1e6:8.2f} us")
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100_000]
+    for size in sizes:
+        run(size)
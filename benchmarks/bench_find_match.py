@@ -0,0 +1,73 @@
+"""Compare MatchIndex against the old linear find_match.
+
+    python benchmarks/bench_find_match.py [sizes...]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from matching import MatchIndex
+from suite import ADJECTIVES, NOUNS, make_world
+
+
+def linear_find_match(input_name, data_dict):
+    """The original three-pass scan from MythicScribeApp.find_match"""
+    input_name_lower = input_name.lower()
+    for key, item in data_dict.items():
+        if input_name_lower == item["name"].lower() or input_name_lower == key.replace("_", " ").lower():
+            return key, item
+    for key, item in data_dict.items():
+        if input_name_lower in item["name"].lower() or input_name_lower in key.replace("_", " ").lower():
+            return key, item
+    input_words = input_name_lower.split()
+    if input_words:
+        for key, item in data_dict.items():
+            target_name_lower = item["name"].lower()
+            target_key_lower = key.replace("_", " ").lower()
+            if all(word in target_name_lower for word in input_words):
+                return key, item
+            if all(word in target_key_lower for word in input_words):
+                return key, item
+    return None, None
+
+
+def make_queries(count, size, rng):
+    queries = ["goblin", "wo", "x", "", "no such beast", "wolf dire", f"{size - 1}", "Frost Imp"]
+    for _ in range(count):
+        i = rng.randrange(size)
+        queries.append(rng.choice([f"{rng.choice(NOUNS)} {i}", f"{i} {rng.choice(ADJECTIVES)}", str(i), f"zzz {i}"]))
+    return queries
+
+
+def timed(func, queries):
+    start = time.perf_counter()
+    results = [func(query) for query in queries]
+    return (time.perf_counter() - start) / len(queries), results
+
+
+def run(size, query_count=200, seed=1):
+    rng = random.Random(seed)
+    creatures = make_world(size, seed)[1]
+    queries = make_queries(query_count, size, rng)
+
+    start = time.perf_counter()
+    index = MatchIndex(creatures)
+    build = time.perf_counter() - start
+
+    linear, expected = timed(lambda q: linear_find_match(q, creatures), queries)
+    indexed, actual = timed(index.find, queries)
+    mismatches = [q for q, a, b in zip(queries, expected, actual) if a[0] != b[0]]
+
+    print(f"{size:>7} entries  build {build * 1000:8.1f} ms  "
+          f"linear {linear * 1e6:10.1f} us/query  indexed {indexed * 1e6:8.1f} us/query  "
+          f"speedup {linear / indexed:6.1f}x  mismatches {len(mismatches)}")
+    return not mismatches
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000]
+    ok = all([run(size) for size in sizes])
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,103 @@
+"""Soak test for the game log: write lots of lines, then scroll around.
+
+Reports write throughput, process RSS and the latency of rendering the
+visible window at random scroll positions (which, for GameLog, includes
+reading paged-out lines back from disk).
+
+    python benchmarks/bench_game_log.py [--lines N] [--richlog]
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from rich.panel import Panel
+from textual.app import App
+from textual.widgets import RichLog
+
+from game_log import GameLog
+
+ART = "\n  /\\_/\\\n ( o.o )\n  > ^ <\n /     \\\n"
+
+
+def rss_mb():
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class SoakApp(App):
+    def __init__(self, use_richlog):
+        super().__init__()
+        self.use_richlog = use_richlog
+
+    def compose(self):
+        yield RichLog(id="log") if self.use_richlog else GameLog(id="log")
+
+
+async def soak(line_count, use_richlog, samples):
+    app = SoakApp(use_richlog)
+    async with app.run_test(size=(100, 40)) as pilot:
+        log = app.query_one("#log")
+        await pilot.pause()
+        rss_before = rss_mb()
+
+        start = time.perf_counter()
+        written = 0
+        while written < line_count:
+            if written % 200 == 0:
+                log.write(Panel(ART, expand=False))
+                written += 7
+            else:
+                log.write(f"> document creature creature {written}: a generated beast of no renown")
+                written += 1
+            if written % 1000 < 7:
+                # Let queued refresh/scroll callbacks run, as they would between commands
+                await pilot.pause()
+        write_time = time.perf_counter() - start
+        await pilot.pause()
+        rss_after = rss_mb()
+
+        total = len(log.lines) if use_richlog else len(log)
+        height = log.scrollable_content_region.height
+        rng = random.Random(1)
+        latencies = []
+        for _ in range(samples):
+            log.scroll_to(y=rng.randrange(max(total - height, 1)), animate=False, immediate=True)
+            start = time.perf_counter()
+            for y in range(height):
+                log.render_line(y)
+            latencies.append(time.perf_counter() - start)
+
+    latencies.sort()
+    name = "RichLog" if use_richlog else "GameLog"
+    print(f"{name}: {total} lines in {write_time:.1f}s ({total / write_time:,.0f} lines/s)")
+    print(f"  RSS {rss_before:.0f} MB -> {rss_after:.0f} MB (+{rss_after - rss_before:.0f} MB)")
+    if not use_richlog:
+        print(f"  {len(log.lines)} lines in memory, {log.paged_line_count} paged to disk")
+    print(f"  visible-window render: p50 {statistics.median(latencies) * 1000:.2f} ms  "
+          f"p99 {latencies[int(len(latencies) * 0.99) - 1] * 1000:.2f} ms over {samples} random scrolls")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lines", type=int, default=1_000_000)
+    parser.add_argument("--samples", type=int, default=500)
+    parser.add_argument("--richlog", action="store_true", help="measure Textual's RichLog instead, for comparison")
+    args = parser.parse_args()
+    asyncio.run(soak(args.lines, args.richlog, args.samples))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Commands per second through the headless engine versus the Textual app.
+
+    python benchmarks/bench_headless.py [transcript] [--repeat N]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+from engine import GameEngine
+from headless import read_script, replay
+
+DEFAULT_TRANSCRIPT = os.path.join(os.path.dirname(__file__), "transcripts", "first_quest.txt")
+
+
+def bench_headless(commands, repeat):
+    start = time.perf_counter()
+    total = sum(replay(commands) for _ in range(repeat))
+    return total, time.perf_counter() - start
+
+
+async def _drive_tui(commands, repeat):
+    from main import MythicScribeApp
+
+    total = 0
+    for _ in range(repeat):
+        app = MythicScribeApp(GameEngine.fresh())
+        async with app.run_test() as pilot:
+            command_input = app.query_one("#command-input")
+            for command in commands:
+                if command in ("quit", "exit"):
+                    break
+                command_input.value = command
+                await command_input.action_submit()
+                await pilot.pause()
+                total += 1
+    return total
+
+
+def bench_tui(commands, repeat):
+    start = time.perf_counter()
+    total = asyncio.run(_drive_tui(commands, repeat))
+    return total, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("transcript", nargs="?", default=DEFAULT_TRANSCRIPT)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    os.chdir(ROOT)  # the app loads tui.css relative to the working directory
+    with open(args.transcript, encoding="utf-8") as f:
+        commands = read_script(f)
+
+    headless_count, headless_time = bench_headless(commands, args.repeat * 50)
+    tui_count, tui_time = bench_tui(commands, args.repeat)
+    headless_rate = headless_count / headless_time
+    tui_rate = tui_count / tui_time
+    print(f"headless {headless_count:>7} commands  {headless_rate:10.0f} commands/s")
+    print(f"tui      {tui_count:>7} commands  {tui_rate:10.0f} commands/s")
+    print(f"headless is {headless_rate / tui_rate:.0f}x faster")
+
+
+if __name__ == "__main__":
+    main()
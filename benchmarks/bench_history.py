@@ -0,0 +1,102 @@
+"""Command history and Tab completion lookups at large sizes.
+
+Fills a CommandHistory with SIZE distinct commands and times Ctrl+R
+searches (first and repeated), adding a command and reloading the history
+file. Then builds an engine with SIZE creatures and quests and times Tab
+completion. Lookups should stay well under a millisecond.
+
+    python benchmarks/bench_history.py [sizes...]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from history import CommandHistory
+from suite import ADJECTIVES, NOUNS, make_world, world_engine
+
+VERBS = ["document creature", "take quest", "complete quest", "go", "travel", "path to"]
+
+SEARCHES = ["", "d", "doc", "take quest", "go ", "travel ancient", "path to frost wyrm 1", "zzz", "look"]
+
+
+def make_commands(count, rng):
+    return [f"{rng.choice(VERBS)} {rng.choice(ADJECTIVES)} {rng.choice(NOUNS)} {i}" for i in range(count)]
+
+
+def timed(func, queries, repeat=50):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for query in queries:
+            func(query)
+    return (time.perf_counter() - start) / (repeat * len(queries))
+
+
+def worst(func, queries, repeat=20):
+    return max(timed(func, [query], repeat) for query in queries)
+
+
+def search_back(history, prefix, steps=10):
+    """The first `steps` Ctrl+R presses"""
+    position = None
+    for _ in range(steps):
+        command, position = history.search(prefix, position)
+        if command is None:
+            break
+
+
+def run_history(size, workdir, seed=1):
+    rng = random.Random(seed)
+    commands = make_commands(size, rng)
+    path = os.path.join(workdir, f"history_{size}")
+    history = CommandHistory(path, max_entries=size)
+
+    start = time.perf_counter()
+    for command in commands:
+        history.add(command)
+    # Repeats move to the end instead of adding entries
+    for command in rng.sample(commands, min(1000, size)):
+        history.add(command)
+    add = (time.perf_counter() - start) / (len(commands) + min(1000, size))
+    history.close()
+
+    start = time.perf_counter()
+    loaded = CommandHistory(path, max_entries=size)
+    loaded.load()
+    load_time = time.perf_counter() - start
+
+    first = timed(lambda prefix: history.search(prefix), SEARCHES)
+    slowest = worst(lambda prefix: history.search(prefix), SEARCHES)
+    repeated = timed(lambda prefix: search_back(history, prefix), SEARCHES, repeat=10) / 10
+    print(f"{size:>8} history entries  add {add * 1e6:6.1f} us  load {load_time * 1000:6.0f} ms  "
+          f"search {first * 1e6:6.1f} us (slowest {slowest * 1e6:6.1f} us, next older {repeated * 1e6:6.1f} us)  "
+          f"entries {len(loaded)}")
+
+
+def run_completion(size, seed=1):
+    engine = world_engine(make_world(size, seed))
+
+    start = time.perf_counter()
+    engine.name_index_for("creatures")
+    engine.name_index_for("quests")
+    build = time.perf_counter() - start
+
+    lines = ["", "t", "take quest the hunt of hall 1", "document creature ", "document creature frost w",
+             "doc", "document creature zzz", f"take quest the hunt of hall {size - 1}"]
+    completion = timed(lambda line: engine.complete(line, limit=21), lines)
+    slowest = worst(lambda line: engine.complete(line, limit=21), lines)
+    common = timed(engine.common_completion, lines)
+    print(f"{size:>8} creatures/quests  build {build * 1000:6.0f} ms  complete {completion * 1e6:6.1f} us "
+          f"(slowest {slowest * 1e6:6.1f} us)  common prefix {common * 1e6:6.1f} us")
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000]
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in sizes:
+            run_history(size, workdir)
+    for size in sizes:
+        run_completion(size)
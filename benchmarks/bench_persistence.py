@@ -0,0 +1,70 @@
+"""Autosave cost per command and load time versus world size.
+
+For each world size, compares appending one command's changes to the
+journal with rewriting a full snapshot (what saving the whole world after
+every command would cost), then times loading a snapshot plus a journal.
+
+    python benchmarks/bench_persistence.py [sizes...]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from engine import GameEngine
+from persistence import SaveGame
+
+COMMANDS = 1000
+
+
+def make_engine(size):
+    quests = {f"quest_{i}": {"name": f"Quest {i}", "reward": "10 gold", "status": "available"} for i in range(size)}
+    creatures = {f"creature_{i}": {"name": f"Creature {i}", "documented": False} for i in range(size)}
+    lore = {f"lore_{i}": {"title": f"Lore {i}", "discovered": False} for i in range(size)}
+    return GameEngine(quests, creatures, lore)
+
+
+def run(size, workdir):
+    path = os.path.join(workdir, f"save_{size}")
+    engine = make_engine(size)
+    save = SaveGame(path, compact_after=10 ** 9)
+    save.attach(engine)
+    save.compact(engine)
+
+    # What one "document creature" command changes
+    start = time.perf_counter()
+    for i in range(COMMANDS):
+        engine.set_state("creatures", f"creature_{i % size}", "documented", True)
+        save.autosave(engine)
+    journal_cost = (time.perf_counter() - start) / COMMANDS
+
+    start = time.perf_counter()
+    snapshots = max(1, min(20, COMMANDS * 100 // size))
+    for _ in range(snapshots):
+        save.compact(engine)
+    snapshot_cost = (time.perf_counter() - start) / snapshots
+
+    # Leave a journal behind the snapshot so loading replays both
+    for i in range(COMMANDS):
+        engine.set_state("quests", f"quest_{i % size}", "status", "active")
+        save.autosave(engine)
+    save.close()
+    snapshot_size = os.path.getsize(path)
+
+    fresh = make_engine(size)
+    start = time.perf_counter()
+    applied = SaveGame(path).load(fresh)
+    load_time = time.perf_counter() - start
+
+    print(f"{size:>8} entries/collection  snapshot {snapshot_size / 1e6:6.1f} MB  "
+          f"autosave {journal_cost * 1e6:7.1f} us/command (full snapshot {snapshot_cost * 1000:8.1f} ms)  "
+          f"load {load_time * 1000:7.0f} ms ({applied} changes)")
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1_000, 10_000, 100_000]
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in sizes:
+            run(size, workdir)
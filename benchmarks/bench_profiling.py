@@ -0,0 +1,59 @@
+"""Cost of profiling.Profiler: commands per second with and without it.
+
+Replays the transcript through a plain engine and through an instrumented
+one, alternating runs so machine noise hits both alike, and prints the
+median of each. Then prints the stats table the instrumented runs built.
+
+    python benchmarks/bench_profiling.py [transcript] [--repeat N]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+from engine import GameEngine
+from headless import read_script, replay
+from profiling import Profiler
+
+DEFAULT_TRANSCRIPT = os.path.join(os.path.dirname(__file__), "transcripts", "first_quest.txt")
+
+
+def rate(commands, repeat, profiler=None):
+    engines = [GameEngine.fresh() for _ in range(repeat)]
+    if profiler is not None:
+        for engine in engines:
+            profiler.instrument(engine)
+    start = time.perf_counter()
+    total = sum(replay(commands, engine) for engine in engines)
+    return total / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("transcript", nargs="?", default=DEFAULT_TRANSCRIPT)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=7)
+    args = parser.parse_args()
+
+    with open(args.transcript, encoding="utf-8") as f:
+        commands = read_script(f)
+
+    profiler = Profiler()
+    plain, instrumented = [], []
+    for _ in range(args.rounds):
+        plain.append(rate(commands, args.repeat))
+        instrumented.append(rate(commands, args.repeat, profiler))
+    plain_rate, instrumented_rate = statistics.median(plain), statistics.median(instrumented)
+    print(f"off {plain_rate:10.0f} commands/s")
+    print(f"on  {instrumented_rate:10.0f} commands/s  ({(plain_rate / instrumented_rate - 1) * 100:.1f}% slower)")
+    print()
+    for line in profiler.stats_lines():
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
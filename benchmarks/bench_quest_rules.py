@@ -0,0 +1,78 @@
+"""Quest condition upkeep with thousands of quests.
+
+Times a state change plus readiness and hint lookups through QuestRules,
+against re-checking every quest's conditions after each change.
+
+    python benchmarks/bench_quest_rules.py [quests]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from quest_rules import QuestRules, _conditions
+
+
+def make_world(count, rng):
+    creatures = {f"creature_{i}": {"name": f"Creature {i}", "documented": False} for i in range(count)}
+    quests = {}
+    for i in range(count):
+        needed = [f"creature_{rng.randrange(count)}" for _ in range(3)]
+        quests[f"quest_{i}"] = {
+            "name": f"Quest {i}",
+            "reward": "10 gold",
+            "status": "active",
+            "location": f"room_{i % 100}",
+            "conditions": {"document": needed},
+            "hints": [{"location": f"room_{i % 100}", "status": "active", "ready": True, "text": "Done!"}],
+        }
+    return quests, creatures
+
+
+def full_recheck(quests, creatures):
+    return {key for key, quest in quests.items()
+            if all(creatures[c]["documented"] for _, c in _conditions(quest["conditions"]))}
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    rng = random.Random(1)
+    quests, creatures = make_world(count, rng)
+    changes = [f"creature_{rng.randrange(count)}" for _ in range(2000)]
+
+    start = time.perf_counter()
+    rules = QuestRules(quests, creatures, {})
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for key in changes:
+        creatures[key]["documented"] = True
+        rules.on_change("creatures", key, "documented")
+        rules.is_ready("quest_0")
+        rules.hints_for("room_0")
+    incremental = (time.perf_counter() - start) / len(changes)
+
+    for creature in creatures.values():
+        creature["documented"] = False
+    recheck_changes = changes[:50]
+    start = time.perf_counter()
+    for key in recheck_changes:
+        creatures[key]["documented"] = True
+        full_recheck(quests, creatures)
+    recheck = (time.perf_counter() - start) / len(recheck_changes)
+
+    # Back to the state the rules were told about (the re-check above changed it behind their back)
+    for key in changes:
+        creatures[key]["documented"] = True
+    ready = {key for key in quests if rules.is_ready(key)}
+    mismatch = ready != full_recheck(quests, creatures)
+
+    print(f"{count} quests  index build {build * 1000:.0f} ms  "
+          f"per change: incremental {incremental * 1e6:.1f} us  full re-check {recheck * 1000:.1f} ms  "
+          f"{'MISMATCH' if mismatch else 'results match'}")
+
+
+if __name__ == "__main__":
+    main()
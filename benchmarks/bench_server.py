@@ -0,0 +1,129 @@
+"""Load generator for server.py: sessions per process, latency and RSS per session.
+
+Starts the server in its own process, opens SESSIONS connections, and
+then has ACTIVE of them replay benchmarks/transcripts/first_quest.txt
+(without the final quit) in a loop for SECONDS. Reports the server's
+RSS per connected session and p50/p99 command round-trip latency.
+
+Before that, builds SharedContent over a generated world of QUESTS quests
+in this process and reports what creating a session costs in time and
+memory there, so per-session work that grows with the content shows up.
+
+    python benchmarks/bench_server.py [SESSIONS] [ACTIVE] [SECONDS] [QUESTS]
+"""
+import asyncio
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+from headless import read_script
+from server import SharedContent
+from suite import make_world
+
+END_OF_RESPONSE = b"\n.\n"
+
+
+def rss_kb(pid):
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return 0
+
+
+async def connect(port):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port, limit=1 << 20)
+    await reader.readuntil(END_OF_RESPONSE)
+    return reader, writer
+
+
+async def play(session, commands, deadline, latencies):
+    reader, writer = session
+    while time.perf_counter() < deadline:
+        for command in commands:
+            start = time.perf_counter()
+            writer.write(command.encode("utf-8") + b"\n")
+            await reader.readuntil(END_OF_RESPONSE)
+            latencies.append(time.perf_counter() - start)
+
+
+async def run(server, port, session_count, active_count, seconds):
+    with open(os.path.join(ROOT, "benchmarks", "transcripts", "first_quest.txt"), encoding="utf-8") as f:
+        commands = [command for command in read_script(f) if command not in ("quit", "exit")]
+
+    base_rss = rss_kb(server.pid)
+    sessions = []
+    start = time.perf_counter()
+    for batch_start in range(0, session_count, 500):
+        batch = min(500, session_count - batch_start)
+        sessions.extend(await asyncio.gather(*(connect(port) for _ in range(batch))))
+    connect_time = time.perf_counter() - start
+    idle_rss = rss_kb(server.pid)
+
+    latencies = []
+    deadline = time.perf_counter() + seconds
+    await asyncio.gather(*(play(session, commands, deadline, latencies) for session in sessions[:active_count]))
+    active_rss = rss_kb(server.pid)
+
+    for _, writer in sessions:
+        writer.close()
+
+    latencies.sort()
+    print(f"sessions: {session_count} connected in {connect_time:.2f}s, {active_count} active for {seconds}s")
+    print(f"server RSS: {base_rss / 1024:.1f} MB empty, {idle_rss / 1024:.1f} MB connected, "
+          f"{active_rss / 1024:.1f} MB after play")
+    print(f"RSS per session: {(idle_rss - base_rss) / session_count:.1f} KB connected, "
+          f"{(active_rss - base_rss) / session_count:.1f} KB after play")
+    if latencies:
+        print(f"commands: {len(latencies)} ({len(latencies) / seconds:.0f}/s)  "
+              f"p50 {statistics.median(latencies) * 1000:.2f} ms  "
+              f"p99 {latencies[int(len(latencies) * 0.99)] * 1000:.2f} ms")
+
+
+def session_cost(quest_count, session_count=10):
+    """Time and memory per new_engine() over a world with `quest_count` quests"""
+    quests, creatures, lore, locations = make_world(quest_count)
+    content = SharedContent(quests, creatures, lore, locations)
+    command = f"take quest {quests['quest_0']['name']}"
+    # The first session builds the shared find_match indexes; don't count those
+    content.new_engine().execute(command)
+    tracemalloc.start()
+    start = time.perf_counter()
+    engines = [content.new_engine() for _ in range(session_count)]
+    elapsed = time.perf_counter() - start
+    for engine in engines:
+        engine.welcome()
+        engine.execute(command)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f"{quest_count} quests: new session {elapsed / session_count * 1000:.2f} ms, "
+          f"{size / session_count / 1024:.1f} KB per session after a command")
+
+
+if __name__ == "__main__":
+    session_count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    active_count = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    seconds = float(sys.argv[3]) if len(sys.argv) > 3 else 5
+    quest_count = int(sys.argv[4]) if len(sys.argv) > 4 else 20_000
+
+    session_cost(quest_count)
+
+    # Every session is a socket on both ends; the server inherits this limit
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+    server = subprocess.Popen([sys.executable, os.path.join(ROOT, "server.py"), "--port", "0"],
+                              stdout=subprocess.PIPE, text=True)
+    try:
+        port = int(server.stdout.readline().rsplit(":", 1)[1])
+        asyncio.run(run(server, port, session_count, min(active_count, session_count), seconds))
+    finally:
+        server.terminate()
+        server.wait()
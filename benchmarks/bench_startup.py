@@ -0,0 +1,55 @@
+"""Time to first frame for `python main.py`.
+
+Starts the app with --profile-startup in a fresh interpreter several times
+and reports the median of each startup phase (see print_startup_profile in
+main.py), plus the wall time of the whole process. Runs without a
+terminal go headless, so the numbers exclude the terminal itself. It is
+measured once with the content snapshot removed before every run (cold)
+and once with it in place (warm).
+
+    python benchmarks/bench_startup.py [runs]
+"""
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+from content_snapshot import SNAPSHOT_PATH
+
+
+def profile_once():
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, os.path.join(ROOT, "main.py"), "--profile-startup"],
+                            stdin=subprocess.DEVNULL, capture_output=True, text=True, check=True, cwd=ROOT)
+    wall = time.perf_counter() - start
+    totals = {}
+    for line in result.stderr.splitlines()[1:]:
+        phase, _, total = line.rsplit(None, 2)
+        totals[phase] = float(total)
+    return totals, wall * 1000
+
+
+def run(label, runs, cold):
+    profiles = []
+    walls = []
+    for _ in range(runs):
+        if cold and os.path.exists(SNAPSHOT_PATH):
+            os.remove(SNAPSHOT_PATH)
+        totals, wall = profile_once()
+        profiles.append(totals)
+        walls.append(wall)
+
+    print(f"{label} (median of {runs} runs, ms since main.py started)")
+    for phase in profiles[0]:
+        print(f"  {phase:<22}{statistics.median(p[phase] for p in profiles):>9.1f}")
+    print(f"  {'process wall time':<22}{statistics.median(walls):>9.1f}")
+
+
+if __name__ == "__main__":
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    run("cold content snapshot", runs, cold=True)
+    run("warm content snapshot", runs, cold=False)
@@ -0,0 +1,88 @@
+"""Navigation on a generated map: go, path to and travel.
+
+Builds a square grid of rooms (10k by default) with north/south/east/west
+exits plus each neighbour's name, then times exit resolution against the
+old per-call linear scan, cold and cached shortest paths, and the full
+travel command through GameEngine.
+
+    python benchmarks/bench_world.py [rooms]
+"""
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from engine import GameEngine
+from world import WorldGraph
+
+
+def make_map(rooms):
+    side = int(math.isqrt(rooms))
+    locations = {}
+    for x in range(side):
+        for y in range(side):
+            exits = {}
+            for direction, nx, ny in (("north", x, y - 1), ("south", x, y + 1), ("west", x - 1, y), ("east", x + 1, y)):
+                if 0 <= nx < side and 0 <= ny < side:
+                    exits[direction] = f"room_{nx}_{ny}"
+                    exits[f"hall {nx} {ny}"] = f"room_{nx}_{ny}"
+            locations[f"room_{x}_{y}"] = {
+                "name": f"Hall {x} {y}",
+                "art": "",
+                "description": f"A generated hall at {x}, {y}.",
+                "exits_text": "Exits lead in every direction.",
+                "exits": exits,
+            }
+    return locations
+
+
+def linear_resolve(locations, current, destination):
+    """How the go command used to match an exit"""
+    for key_phrase, actual_location in locations[current]["exits"].items():
+        if destination.lower() == key_phrase.lower() or destination.lower() in key_phrase.lower():
+            return actual_location
+    return None
+
+
+def timed(func, calls):
+    start = time.perf_counter()
+    for args in calls:
+        func(*args)
+    return (time.perf_counter() - start) / len(calls)
+
+
+def main():
+    rooms = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    locations = make_map(rooms)
+    keys = list(locations)
+    rng = random.Random(1)
+    world = WorldGraph(locations)
+
+    go_calls = [(rng.choice(keys), rng.choice(["north", "south", "east", "west", "hall", "nowhere"])) for _ in range(20_000)]
+    mismatches = sum(world.resolve_exit(*call) != linear_resolve(locations, *call) for call in go_calls)
+    linear = timed(lambda current, destination: linear_resolve(locations, current, destination), go_calls)
+    indexed = timed(world.resolve_exit, go_calls)
+    print(f"{len(locations)} rooms")
+    print(f"  go: linear {linear * 1e6:.2f} us  precomputed {indexed * 1e6:.2f} us  mismatches {mismatches}")
+
+    path_calls = [(rng.choice(keys), rng.choice(keys)) for _ in range(20)]
+    cold = timed(lambda source, target: (world.invalidate(), world.shortest_path(source, target)), path_calls)
+    for call in path_calls:
+        world.shortest_path(*call)
+    cached = timed(world.shortest_path, path_calls)
+    print(f"  shortest path: cold {cold * 1000:.1f} ms  cached tree {cached * 1e6:.1f} us")
+
+    engine = GameEngine(quests={}, creatures={}, lore={}, locations=locations,
+                        player_state={"name": "Scribe", "gold": 0, "inventory": [], "current_location": keys[0]})
+    targets = [f"hall {rng.randrange(int(math.isqrt(rooms)))} {rng.randrange(int(math.isqrt(rooms)))}" for _ in range(50)]
+    start = time.perf_counter()
+    for target in targets:
+        engine.execute(f"travel {target}")
+    print(f"  travel command (match + path + look): {(time.perf_counter() - start) / len(targets) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,324 @@
+"""Benchmark suite for the game loop, with regression checks against a baseline.
+
+Times the hot paths on the recorded transcripts in benchmarks/transcripts
+and on a generated world of SIZE creatures, quests, lore entries and
+locations, both through GameEngine directly and through MythicScribeApp
+driven by Textual's headless pilot:
+
+    python benchmarks/suite.py --output results.json
+    python benchmarks/suite.py --compare results.json [--threshold 0.25]
+
+Every case reports the median and best time per operation over several
+rounds. With --compare, cases whose median got slower than the baseline's
+by more than the threshold are flagged and the exit status is 1. Baselines
+are only comparable on the same machine and with the same --size.
+"""
+import argparse
+import asyncio
+import datetime
+import glob
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+from engine import GameEngine
+from headless import read_script
+
+TRANSCRIPTS = os.path.join(os.path.dirname(__file__), "transcripts")
+
+ADJECTIVES = ["dire", "ancient", "shadow", "lesser", "greater", "frost", "ember", "bog", "cave", "storm"]
+NOUNS = ["goblin", "wolf", "wyrm", "troll", "spider", "wraith", "golem", "harpy", "imp", "serpent"]
+
+ART = "\n  /\\_/\\\n ( o.o )\n  > ^ <\n"
+
+
+def make_world(size, seed=1):
+    """(quests, creatures, lore, locations) with `size` of each.
+
+    Locations form a ring of rooms, each quest asks for three creatures to
+    be documented in one room, and half the creatures and lore entries are
+    already documented or discovered so the listings show both kinds.
+    """
+    rng = random.Random(seed)
+    locations = {}
+    for i in range(size):
+        after, before = (i + 1) % size, (i - 1) % size
+        locations[f"room_{i}"] = {
+            "name": f"Hall {i}",
+            "art": ART,
+            "description": f"A generated hall, number {i} of {size}.",
+            "exits_text": f"Passages lead '[bold magenta]on[/bold magenta]' to hall {after} and "
+                          f"'[bold magenta]back[/bold magenta]' to hall {before}.",
+            "go_hint": "Try '[bold green]go on[/bold green]'",
+            "exits": {"on": f"room_{after}", f"hall {after}": f"room_{after}",
+                      "back": f"room_{before}", f"hall {before}": f"room_{before}"},
+        }
+    creatures = {}
+    for i in range(size):
+        adjective, noun = rng.choice(ADJECTIVES), rng.choice(NOUNS)
+        creatures[f"{adjective}_{noun}_{i}"] = {
+            "name": f"{adjective.title()} {noun.title()} {i}",
+            "description": f"A {adjective} {noun} seen around hall {i}.",
+            "danger_level": "low",
+            "documented": i % 2 == 0,
+            "ascii_art": ART,
+        }
+    creature_keys = list(creatures)
+    lore = {f"lore_{i}": {"title": f"Chronicle {i}", "text": f"The {i}th chronicle of Eldoria.",
+                          "discovered": i % 2 == 0, "ascii_art": ART} for i in range(size)}
+    quests = {}
+    for i in range(size):
+        room = f"room_{i}"
+        quests[f"quest_{i}"] = {
+            "name": f"The Hunt of Hall {i}",
+            "description": f"Document the creatures of hall {i}.",
+            "reward": "10 gold",
+            "status": "available",
+            "location": room,
+            "conditions": {"document": [rng.choice(creature_keys) for _ in range(3)]},
+            "hints": [
+                {"location": room, "status": "available", "text": f"A notice asks for 'take quest hunt of hall {i}'."},
+                {"location": room, "status": "active", "ready": True, "text": "Perhaps it's time to complete it."},
+            ],
+        }
+    return quests, creatures, lore, locations
+
+
+def world_engine(world):
+    quests, creatures, lore, locations = world
+    player_state = {"name": "Scribe", "gold": 100, "inventory": [], "current_location": "room_0"}
+    return GameEngine(quests, creatures, lore, locations, player_state=player_state)
+
+
+def world_commands(world, count, seed=2):
+    """A synthetic session: take quests, document creatures, move and list"""
+    rng = random.Random(seed)
+    quests, creatures, _, locations = world
+    creature_names = [creature["name"].lower() for creature in creatures.values()]
+    size = len(locations)
+    commands = []
+    for _ in range(count):
+        i = rng.randrange(size)
+        commands.append(rng.choice([
+            f"take quest hunt of hall {i}",
+            f"document creature {rng.choice(creature_names)}",
+            f"complete quest hunt of hall {i}",
+            "go on",
+            f"go hall {i}",
+            "look",
+            "inventory",
+            "quests",
+            "document creature no such beast",
+        ]))
+    return commands
+
+
+def load_transcripts(pattern=None):
+    transcripts = {}
+    for path in sorted(glob.glob(pattern or os.path.join(TRANSCRIPTS, "*.txt"))):
+        with open(path, encoding="utf-8") as f:
+            transcripts[os.path.splitext(os.path.basename(path))[0]] = read_script(f)
+    return transcripts
+
+
+def measure(run, rounds):
+    """Call run() `rounds` times. Each call returns (seconds, operations)."""
+    per_op = []
+    operations = 0
+    for _ in range(rounds):
+        seconds, count = run()
+        per_op.append(seconds / count)
+        operations += count
+    return {"median_us": statistics.median(per_op) * 1e6, "best_us": min(per_op) * 1e6, "operations": operations}
+
+
+def timed_calls(func, args_list):
+    start = time.perf_counter()
+    for args in args_list:
+        func(*args)
+    return time.perf_counter() - start, len(args_list)
+
+
+def engine_cases(world, transcripts):
+    """name -> run() for the cases that call GameEngine directly"""
+    rng = random.Random(3)
+    engine = world_engine(world)
+    quests, creatures, lore, locations = world
+    size = len(creatures)
+    queries = [f"{rng.choice(NOUNS)} {rng.randrange(size)}" for _ in range(200)]
+    queries += [f"hunt of hall {rng.randrange(size)}" for _ in range(50)] + ["zzz", "wo", "x"]
+    match_calls = [(query, creatures) for query in queries] + [(query, quests) for query in queries]
+    rooms = [(key,) for key in rng.sample(list(locations), min(200, size))]
+
+    def look_at(room):
+        engine.player_state["current_location"] = room
+        engine.look()
+
+    listing_calls = max(1, 20_000 // size)
+    synthetic = world_commands(world, 1000)
+
+    def synthetic_round_trip():
+        fresh = world_engine(make_world(size))
+        fresh.welcome()
+        return timed_calls(fresh.execute, [(command,) for command in synthetic])
+
+    cases = {
+        "engine find_match": lambda: timed_calls(engine.find_match, match_calls),
+        "engine look": lambda: timed_calls(look_at, rooms),
+        "engine creatures listing": lambda: timed_calls(engine.execute, [("creatures",)] * listing_calls),
+        "engine lore listing": lambda: timed_calls(engine.execute, [("lore",)] * listing_calls),
+        "engine synthetic round trip": synthetic_round_trip,
+    }
+    for name, commands in transcripts.items():
+        def transcript_round_trip(commands=commands):
+            engines = [GameEngine.fresh() for _ in range(50)]
+            start = time.perf_counter()
+            count = 0
+            for replay_engine in engines:
+                replay_engine.welcome()
+                for command in commands:
+                    replay_engine.execute(command)
+                    count += 1
+            return time.perf_counter() - start, count
+        cases[f"engine transcript {name}"] = transcript_round_trip
+    return cases
+
+
+async def measure_tui(world, transcripts, rounds, only=None):
+    """The same paths through MythicScribeApp, rendered into the game log"""
+    from main import MythicScribeApp
+
+    results = {}
+    size = len(world[1])
+
+    async def run_case(name, engine, operation, count):
+        if only and only not in name:
+            return
+        per_op = []
+        app = MythicScribeApp(engine)
+        async with app.run_test() as pilot:
+            app.warm_up()
+            await pilot.pause()
+            for _ in range(rounds):
+                start = time.perf_counter()
+                for _ in range(count):
+                    await operation(app, pilot)
+                per_op.append((time.perf_counter() - start) / count)
+        results[name] = {"median_us": statistics.median(per_op) * 1e6, "best_us": min(per_op) * 1e6,
+                         "operations": rounds * count}
+
+    def render(command):
+        async def operation(app, pilot):
+            app.render_events(app.engine.execute(command))
+            await pilot.pause()
+        return operation
+
+    await run_case("tui look", world_engine(world), render("look"), 50)
+    listing_count = max(1, 2000 // size)
+    await run_case("tui creatures listing", world_engine(world), render("creatures"), listing_count)
+    await run_case("tui lore listing", world_engine(world), render("lore"), listing_count)
+
+    for name, commands in transcripts.items():
+        commands = [command for command in commands if command not in ("quit", "exit")]
+        submitted = iter(())
+
+        async def submit(app, pilot):
+            nonlocal submitted
+            command = next(submitted, None)
+            if command is None:
+                submitted = iter(commands)
+                command = next(submitted)
+            command_input = app.query_one("#command-input")
+            command_input.value = command
+            await command_input.action_submit()
+            await pilot.pause()
+
+        await run_case(f"tui transcript {name}", GameEngine.fresh(), submit, len(commands) * 5)
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Print each case against the baseline. Returns the regressed case names."""
+    regressions = []
+    print(f"\n{'case':<40}{'baseline us':>14}{'now us':>12}{'change':>9}")
+    for name, result in results.items():
+        before = baseline.get("results", {}).get(name)
+        if before is None:
+            print(f"{name:<40}{'-':>14}{result['median_us']:>12.2f}{'new':>9}")
+            continue
+        change = result["median_us"] / before["median_us"] - 1
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        elif change < -threshold:
+            flag = "  faster"
+        print(f"{name:<40}{before['median_us']:>14.2f}{result['median_us']:>12.2f}{change * 100:>8.1f}%{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the game loop and compare against a baseline.")
+    parser.add_argument("--size", type=int, default=1000,
+                        help="creatures, quests, lore entries and locations in the generated world")
+    parser.add_argument("--rounds", type=int, default=5, help="timed rounds per case")
+    parser.add_argument("--transcripts", help="glob of command scripts to replay (default benchmarks/transcripts/*.txt)")
+    parser.add_argument("--only", help="run only cases whose name contains this")
+    parser.add_argument("--no-tui", action="store_true", help="skip the cases that drive the Textual app")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="flag regressions against this earlier --output file")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="slowdown of the median that counts as a regression (default 0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    os.chdir(ROOT)  # the app loads tui.css relative to the working directory
+    world = make_world(args.size)
+    transcripts = load_transcripts(args.transcripts)
+
+    results = {}
+    for name, run in engine_cases(world, transcripts).items():
+        if args.only and args.only not in name:
+            continue
+        results[name] = measure(run, args.rounds)
+        print(f"{name:<40}{results[name]['median_us']:>12.2f} us/op  (best {results[name]['best_us']:.2f})")
+    if not args.no_tui:
+        for name, result in asyncio.run(measure_tui(world, transcripts, args.rounds, args.only)).items():
+            results[name] = result
+            print(f"{name:<40}{result['median_us']:>12.2f} us/op  (best {result['best_us']:.2f})")
+
+    report = {
+        "meta": {
+            "date": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "size": args.size,
+            "rounds": args.rounds,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("meta", {}).get("size") != args.size:
+            print(f"warning: the baseline was run with --size {baseline.get('meta', {}).get('size')}", file=sys.stderr)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+import time
+
+from matching import PrefixIndex
+
+
+class Command:
+    """One registered command: its verb, handler, help text and timing counters."""
+
+    __slots__ = ("name", "handler", "takes_argument", "argument_optional", "usage", "help", "hidden", "completes",
+                 "calls", "total_time")
+
+    def __init__(self, name, handler, takes_argument=False, usage=None, help="", hidden=False, completes=None,
+                 argument_optional=False):
+        self.name = name
+        self.handler = handler
+        self.takes_argument = takes_argument or argument_optional
+        # The bare name also runs the command, with "" as the argument
+        self.argument_optional = argument_optional
+        self.usage = usage or (f"{name} [argument]" if self.takes_argument else name)
+        self.help = help
+        self.hidden = hidden
+        # Engine collection ("quests", "creatures"...) whose names Tab completes the argument from
+        self.completes = completes
+        self.calls = 0
+        self.total_time = 0.0
+
+    def run(self, argument, *context):
+        """Call the handler with `context` (e.g. the engine) and the argument"""
+        start = time.perf_counter()
+        try:
+            if self.takes_argument:
+                return self.handler(*context, argument)
+            return self.handler(*context)
+        finally:
+            self.calls += 1
+            self.total_time += time.perf_counter() - start
+
+
+class CommandRegistry:
+    """Table of commands keyed on their first word.
+
+    Commands, aliases, suggestions for unknown input and the help text all
+    live here, so adding a command is one register() call. A command without
+    an argument only matches its exact name; one with an argument matches
+    "<name> <argument>" and gets the stripped rest of the line, or "" for the
+    bare name if the argument is optional.
+    """
+
+    def __init__(self):
+        self.commands = {}      # name -> Command, in registration order
+        self.aliases = {}       # whole input line -> replacement line
+        self.suggestions = []   # (keywords, text), first hit wins
+        self.shortcuts = []     # (key, text) for the help screen
+        self._by_verb = {}      # first word -> commands, longest name first
+        self._names = None      # PrefixIndex of command names, see name_index()
+
+    def register(self, name, handler, takes_argument=False, aliases=(), usage=None, help="", hidden=False,
+                 completes=None, argument_optional=False):
+        command = Command(name, handler, takes_argument, usage, help, hidden, completes, argument_optional)
+        self.commands[name] = command
+        self._names = None
+        candidates = self._by_verb.setdefault(name.split()[0], [])
+        candidates.append(command)
+        candidates.sort(key=lambda c: len(c.name), reverse=True)
+        for alias in aliases:
+            self.aliases[alias] = name
+        return command
+
+    def add_suggestion(self, keywords, text):
+        """Suggest `text` when unknown input contains any of `keywords`"""
+        self.suggestions.append((tuple(keywords), text))
+
+    def add_shortcut(self, key, text):
+        self.shortcuts.append((key, text))
+
+    def expand_alias(self, line):
+        return self.aliases.get(line, line)
+
+    def resolve(self, line):
+        """Return (command, argument) for an input line, or (None, None)"""
+        for command in self._by_verb.get(line.split(" ", 1)[0], ()):
+            if command.takes_argument:
+                prefix = command.name + " "
+                if line.startswith(prefix):
+                    return command, line[len(prefix):].strip()
+                if command.argument_optional and line == command.name:
+                    return command, ""
+            elif line == command.name:
+                return command, None
+        return None, None
+
+    def name_index(self):
+        """PrefixIndex of the command names, for Tab completion. Names of
+        commands taking an argument end in a space, ready for the argument."""
+        if self._names is None:
+            self._names = PrefixIndex(command.name + " " if command.takes_argument else command.name
+                                      for command in self.commands.values())
+        return self._names
+
+    def dispatch(self, line, *context):
+        """Run the command for `line`, passing `context` to its handler.
+        Returns False if nothing matched."""
+        command, argument = self.resolve(line)
+        if command is None:
+            return False
+        command.run(argument, *context)
+        return True
+
+    def suggest(self, line):
+        for keywords, text in self.suggestions:
+            if any(keyword in line for keyword in keywords):
+                return [text]
+        return []
+
+    def help_lines(self):
+        lines = ["\n--- Available Commands ---"]
+        for command in self.commands.values():
+            if command.hidden:
+                continue
+            lines.append(f"  [bold green]{command.usage}[/bold green]: {command.help}")
+        if self.shortcuts:
+            lines.append("\n--- Shortcuts ---")
+            for key, text in self.shortcuts:
+                lines.append(f"  [bold cyan]{key}[/bold cyan]: {text}")
+        return lines
+
+    def timings(self):
+        """Per-command (calls, total seconds, mean seconds), busiest first"""
+        rows = [(c.name, c.calls, c.total_time, c.total_time / c.calls)
+                for c in self.commands.values() if c.calls]
+        return sorted(rows, key=lambda row: row[2], reverse=True)
@@ -0,0 +1,298 @@
+"""Content packs: directories of entries layered over the built-in content.
+
+A pack is a directory of JSON-lines files named after the collection they
+add to, creatures.jsonl, quests.jsonl, lore.jsonl and locations.jsonl, or
+creatures.<part>.jsonl to split a big collection over several files. The
+first line of a file is a header naming the format; every other line is
+one entry:
+
+    {"format": "mythic-scribe-pack", "version": 1}
+    ["goblin", {"name": "Goblin", "description": "...", "documented": false}]
+
+Packs are applied in the order given, so an entry replaces the one with
+the same key from data/*.py or from an earlier pack. `python
+content_packs.py export DIR` writes the built-in content as a pack to start
+from; `python main.py --pack DIR` plays with it and reloads it as it is
+edited.
+
+poll() only re-reads files whose mtime or size changed, and of those only
+parses the lines between where the new and the last contents start and
+stop differing, so reloading costs a byte comparison of the changed files
+plus the size of the edit, not a parse of the pack. Split big collections
+over several files to keep the comparison small too. Keys should be unique
+within a file.
+"""
+import json
+import os
+
+FORMAT = "mythic-scribe-pack"
+VERSION = 1
+COLLECTIONS = ("quests", "creatures", "lore", "locations")
+SUFFIX = ".jsonl"
+
+# Bytes compared at a time when looking for where a re-read file differs
+CHUNK = 1 << 16
+
+
+def _header():
+    return json.dumps({"format": FORMAT, "version": VERSION}) + "\n"
+
+
+def pack_collection(file_name):
+    """The collection a pack file adds to, from its name, or None if it isn't a pack file"""
+    if not file_name.endswith(SUFFIX):
+        return None
+    collection = file_name[:-len(SUFFIX)].split(".", 1)[0]
+    return collection if collection in COLLECTIONS else None
+
+
+def write_pack_file(path, entries):
+    """Write {key: entry} as a pack file, replacing any file at `path`"""
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        f.write(_header())
+        f.writelines(json.dumps([key, entry], ensure_ascii=False) + "\n" for key, entry in entries.items())
+    os.replace(temp_path, path)
+
+
+def detached(entry):
+    """A plain dict copy of an entry, which may be a LazyRecord or an EntityRecord view"""
+    return entry.materialize() if hasattr(entry, "materialize") else dict(entry)
+
+
+def _matching_length(same, limit):
+    """The largest n <= limit with same(0, n), where same(i, j) compares
+    bytes i to j counted from one edge of two buffers"""
+    start = end = 0
+    while start < limit:
+        end = min(start + CHUNK, limit)
+        if not same(start, end):
+            break
+        start = end
+    else:
+        return limit
+    # Bisect within the chunk that differs
+    while end - start > 1:
+        middle = (start + end) // 2
+        if same(start, middle):
+            start = middle
+        else:
+            end = middle
+    return start
+
+
+def changed_lines(old, new):
+    """(lines only in old, lines only in new, new lines in order) around where two versions of a file differ.
+
+    The common prefix and suffix are found with C-level comparisons, so
+    only the lines between them are split and compared.
+    """
+    view = memoryview(new)
+    limit = min(len(old), len(new))
+    prefix = _matching_length(lambda i, j: old.startswith(view[i:j], i), limit)
+    suffix = _matching_length(lambda i, j: old.startswith(view[len(new) - j:len(new) - i], len(old) - j),
+                              limit - prefix)
+    start = old.rfind(b"\n", 0, prefix) + 1
+    old_stop, new_stop = old.find(b"\n", len(old) - suffix), new.find(b"\n", len(new) - suffix)
+    old_lines = old[start:len(old) if old_stop < 0 else old_stop].splitlines()
+    new_lines = new[start:len(new) if new_stop < 0 else new_stop].splitlines()
+    old_set, new_set = set(old_lines), set(new_lines)
+    return old_set - new_set, [line for line in new_lines if line not in old_set]
+
+
+class PackFile:
+    """One pack file, keeping its last contents so a re-read can tell what changed"""
+
+    def __init__(self, path, collection):
+        self.path = path
+        self.collection = collection
+        self.signature = None       # (mtime, size) when last read
+        self.entries = {}           # key -> entry, in file order
+        self._data = None           # the file as last read
+
+    def refresh(self, errors):
+        """Re-read the file if it changed since the last read.
+
+        Returns the keys whose entry was added, changed or removed. Lines
+        that aren't valid entries are skipped and reported in `errors`.
+        """
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return self.clear()
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if signature == self.signature:
+            return []
+        # Set first, so a file that fails to parse is reported once per edit
+        self.signature = signature
+        with open(self.path, "rb") as f:
+            data = f.read()
+        header_end = data.find(b"\n") + 1 or len(data)
+        try:
+            header = json.loads(data[:header_end])
+        except ValueError:
+            header = None
+        if not isinstance(header, dict) or header.get("format") != FORMAT:
+            raise ValueError(f"{self.path} is not a content pack file")
+        if header.get("version") != VERSION:
+            raise ValueError(f"{self.path} is pack version {header.get('version')}, expected {VERSION}")
+
+        changed = {}
+        if self._data is None or not self._data.startswith(memoryview(data)[:header_end]):
+            # First read, or a new header: read every entry again
+            changed = dict.fromkeys(self.entries)
+            self.entries = {}
+            removed, added = (), data[header_end:].splitlines()
+        else:
+            # The headers match, so the changed lines start after them
+            removed, added = changed_lines(self._data, data)
+        self._data = data
+
+        for line in removed:
+            entry = self._parse(line)
+            if entry is not None:
+                self.entries.pop(entry[0], None)
+                changed[entry[0]] = None
+        for line in added:
+            entry = self._parse(line, errors)
+            if entry is not None:
+                self.entries[entry[0]] = entry[1]
+                changed[entry[0]] = None
+        return list(changed)
+
+    def _parse(self, line, errors=None):
+        """(key, entry) from one line, or None for a blank, header or broken line"""
+        if not line.strip():
+            return None
+        try:
+            key, entry = json.loads(line)
+            if isinstance(key, str) and isinstance(entry, dict):
+                return key, entry
+        except ValueError:
+            pass
+        if errors is not None:
+            errors.append(f"{self.path}: skipped a line that isn't a [key, entry] pair: {line[:60]!r}")
+        return None
+
+    def clear(self):
+        """Forget the file's entries (it was deleted). Returns their keys."""
+        keys = list(self.entries)
+        self.entries.clear()
+        self._data = None
+        self.signature = None
+        return keys
+
+
+class ContentPacks:
+    """The packs in the directories at `paths`, later ones taking precedence"""
+
+    def __init__(self, paths):
+        self.paths = list(paths)
+        self.errors = []            # problems found by the last load() or poll()
+        self._files = {}            # path -> PackFile, in precedence order
+        # (collection, key) -> the entry a pack replaced, or None if packs added the key
+        self._base = {}
+        self._unreadable = set()    # directories whose listing failed, reported once until it works again
+
+    def _scan(self):
+        """(path, collection) of every pack file, lowest precedence first.
+        Directories that can't be listed are reported in `errors`."""
+        for directory in self.paths:
+            try:
+                names = sorted(os.listdir(directory))
+            except OSError as error:
+                if directory not in self._unreadable:
+                    self._unreadable.add(directory)
+                    self.errors.append(f"can't read content pack {directory}: {error}")
+                continue
+            self._unreadable.discard(directory)
+            for name in names:
+                collection = pack_collection(name)
+                if collection is not None:
+                    yield os.path.join(directory, name), collection
+
+    def load(self, content):
+        """Read every pack and apply it to a load_content()-style dict in place.
+
+        Call it before the content is turned into EntityTables or handed
+        to an engine. Returns `content`. Files that can't be read are
+        reported in `errors` and picked up by poll() once they are fixed.
+        """
+        self.errors = []
+        for path, collection in self._scan():
+            pack_file = self._files[path] = PackFile(path, collection)
+            try:
+                pack_file.refresh(self.errors)
+            except (OSError, ValueError) as error:
+                self.errors.append(str(error))
+                continue
+            entries = content[collection]
+            for key, entry in pack_file.entries.items():
+                if (collection, key) not in self._base:
+                    self._base[collection, key] = entries.get(key)
+                entries[key] = dict(entry)
+        return content
+
+    def winner(self, collection, key):
+        """The entry the packs give this key, or None if none of them has it"""
+        for pack_file in reversed(self._files.values()):
+            if pack_file.collection == collection and key in pack_file.entries:
+                return pack_file.entries[key]
+        return None
+
+    def poll(self, content):
+        """Re-read the pack files that changed since the last load() or poll().
+
+        `content` maps collection names to the entries being played with
+        (GameEngine.content()). Returns [(collection, key, entry)] for every
+        key whose entry changed, where entry is what the key should hold
+        now, or None if it should be removed. Files that can't be read are
+        left as they were and reported in `errors`.
+        """
+        self.errors = []
+        files = {}
+        changed = {}
+        for path, collection in self._scan():
+            pack_file = files[path] = self._files.get(path) or PackFile(path, collection)
+            try:
+                keys = pack_file.refresh(self.errors)
+            except (OSError, ValueError) as error:
+                self.errors.append(str(error))
+                continue
+            changed.update(((collection, key), None) for key in keys)
+        for path in self._files.keys() - files.keys():
+            pack_file = self._files[path]
+            changed.update(((pack_file.collection, key), None) for key in pack_file.clear())
+        self._files = files
+
+        changes = []
+        for collection, key in changed:
+            if (collection, key) not in self._base:
+                # First time a pack touches this key, so keep what it replaces
+                current = content[collection].get(key)
+                self._base[collection, key] = None if current is None else detached(current)
+            entry = self.winner(collection, key)
+            if entry is None:
+                entry = self._base[collection, key]
+            changes.append((collection, key, None if entry is None else detached(entry)))
+        return changes
+
+
+def export(directory):
+    """Write the built-in data/*.py content as a pack"""
+    from content_snapshot import load_content
+    content, _ = load_content()
+    os.makedirs(directory, exist_ok=True)
+    for collection in COLLECTIONS:
+        write_pack_file(os.path.join(directory, collection + SUFFIX), content[collection])
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Mythic Scribe content packs")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    export_parser = subcommands.add_parser("export", help="write the data/*.py content as a pack")
+    export_parser.add_argument("directory")
+    args = parser.parse_args()
+    export(args.directory)
@@ -0,0 +1,72 @@
+"""Precompiled snapshot of the data/*.py content for fast startup.
+
+Importing the data modules executes their dict literals every time.
+Instead the content is marshalled once into data/__pycache__/content.snapshot
+and loaded from there, which only rebuilds the dicts. The snapshot records
+the mtime and size of every source module and is rebuilt as soon as any of
+them changes. Each load returns new dicts, so callers may mutate them freely.
+"""
+import marshal
+import os
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+SNAPSHOT_PATH = os.path.join(DATA_DIR, "__pycache__", "content.snapshot")
+COLLECTIONS = ("quests", "creatures", "lore", "locations")
+VERSION = 1
+
+# The last snapshot read in this process, so repeated loads skip the disk
+_cached = None
+
+
+def source_signature():
+    signature = []
+    for name in COLLECTIONS:
+        stat = os.stat(os.path.join(DATA_DIR, f"{name}.py"))
+        signature.append((name, stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+
+def import_content():
+    """Load the content the slow way, from the data modules"""
+    from data.quests import quests
+    from data.creatures import creatures
+    from data.lore import lore
+    from data.locations import locations
+    return {"quests": quests, "creatures": creatures, "lore": lore, "locations": locations}
+
+
+def write_snapshot(signature, content, path=SNAPSHOT_PATH):
+    data = marshal.dumps((VERSION, signature, content))
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+    except OSError:
+        # A read-only install just keeps importing the modules
+        pass
+    return data
+
+
+def load_content(path=SNAPSHOT_PATH):
+    """Return ({collection: entries}, whether the snapshot was used)"""
+    global _cached
+    signature = source_signature()
+    if _cached is not None and _cached[0] == signature:
+        return marshal.loads(_cached[1])[2], True
+
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+        version, snapshot_signature, content = marshal.loads(data)
+        if version == VERSION and snapshot_signature == signature:
+            _cached = (signature, data)
+            return content, True
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+
+    # marshal round-trip so the caller gets its own copy, like a snapshot load
+    data = write_snapshot(signature, import_content(), path)
+    _cached = (signature, data)
+    return marshal.loads(data)[2], False
@@ -0,0 +1,170 @@
+"""Compact on-disk content store for quests, creatures, lore and locations.
+
+A store file is a small header, a JSON index and a blob region:
+
+    b"MSCS" | version (u32) | index length (u64) | index | blobs
+
+The index holds every entry's key and its short fields (names, flags,
+danger levels...). Long text fields (descriptions, lore text, ASCII art)
+are stored in the blob region as UTF-8 and only decoded when something
+reads them. The file is opened with mmap, so blobs that are never shown
+never leave the page cache.
+
+Build a store from the data/*.py modules with:
+
+    python content_store.py build data/content.msc
+"""
+import copy
+import json
+import mmap
+import struct
+import sys
+
+MAGIC = b"MSCS"
+VERSION = 1
+HEADER = struct.Struct("<4sIQ")
+
+# Fields kept in the blob region and decoded on demand
+LAZY_FIELDS = ("description", "text", "ascii_art", "art")
+
+COLLECTIONS = ("quests", "creatures", "lore", "locations")
+
+
+class LazyRecord(dict):
+    """A content entry whose long text fields are read from the store on first use.
+
+    Behaves like the plain dicts in data/*.py for the ways the game uses
+    them: item["field"], "field" in item, item.get("field") and assignment.
+    """
+
+    __slots__ = ("_store", "_lazy")
+
+    def __init__(self, fields, store, lazy):
+        super().__init__(fields)
+        self._store = store
+        self._lazy = lazy    # field -> (offset, length) in the blob region
+
+    def __missing__(self, field):
+        span = self._lazy.get(field)
+        if span is None:
+            raise KeyError(field)
+        value = self._store.read_blob(*span)
+        self[field] = value
+        return value
+
+    def __contains__(self, field):
+        return dict.__contains__(self, field) or field in self._lazy
+
+    def get(self, field, default=None):
+        return self[field] if field in self else default
+
+    def materialize(self):
+        """Return a plain dict with every field decoded"""
+        return {field: self[field] for field in (*dict.keys(self), *self._lazy) if field in self}
+
+    def __deepcopy__(self, memo):
+        # The store is read-only and shared; only the loaded fields are copied
+        return LazyRecord(copy.deepcopy(dict(self), memo), self._store, self._lazy)
+
+    def __reduce__(self):
+        return dict, (self.materialize(),)
+
+
+class ContentStore:
+    """A content store file opened with mmap"""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, index_length = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a content store")
+        if version != VERSION:
+            raise ValueError(f"{path} is content store version {version}, expected {VERSION}")
+        index_start = HEADER.size
+        self._blob_start = index_start + index_length
+        self._index = json.loads(self._map[index_start:self._blob_start])
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def read_blob(self, offset, length):
+        start = self._blob_start + offset
+        return self._map[start:start + length].decode("utf-8")
+
+    def load(self, collection):
+        """Build the {key: LazyRecord} dict for one collection"""
+        section = self._index.get(collection)
+        if section is None:
+            return {}
+        eager, lazy = section["eager"], section["lazy"]
+        eager_count = len(eager)
+        entries = {}
+        for row in section["entries"]:
+            key = row[0]
+            fields = {field: value for field, value in zip(eager, row[1:1 + eager_count]) if value is not None}
+            spans = row[1 + eager_count:]
+            offsets = {lazy[i]: (spans[2 * i], spans[2 * i + 1])
+                       for i in range(len(lazy)) if spans[2 * i] >= 0}
+            entries[key] = LazyRecord(fields, self, offsets)
+        return entries
+
+    def load_all(self):
+        return {collection: self.load(collection) for collection in COLLECTIONS}
+
+
+def write_store(path, collections):
+    """Write {collection name: {key: entry dict}} to a store file"""
+    index = {}
+    blobs = bytearray()
+    for name, entries in collections.items():
+        fields = []
+        for entry in entries.values():
+            for field in entry:
+                if field not in fields:
+                    fields.append(field)
+        lazy = [field for field in fields if field in LAZY_FIELDS]
+        eager = [field for field in fields if field not in LAZY_FIELDS]
+
+        rows = []
+        for key, entry in entries.items():
+            row = [key]
+            row.extend(entry.get(field) for field in eager)
+            for field in lazy:
+                if field in entry:
+                    data = entry[field].encode("utf-8")
+                    row.extend((len(blobs), len(data)))
+                    blobs += data
+                else:
+                    row.extend((-1, 0))
+            rows.append(row)
+        index[name] = {"eager": eager, "lazy": lazy, "entries": rows}
+
+    index_bytes = json.dumps(index, separators=(",", ":")).encode("utf-8")
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(index_bytes)))
+        f.write(index_bytes)
+        f.write(blobs)
+
+
+def build_from_modules(path):
+    """Convert the data/*.py modules into a store file"""
+    from data.quests import quests
+    from data.creatures import creatures
+    from data.lore import lore
+    from data.locations import locations
+    write_store(path, {"quests": quests, "creatures": creatures, "lore": lore, "locations": locations})
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3 or sys.argv[1] != "build":
+        sys.exit("usage: python content_store.py build OUTPUT")
+    build_from_modules(sys.argv[2])
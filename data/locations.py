@@ -0,0 +1,34 @@
+locations = {
+    "scribe_office": {
+        "name": "Scribe's Office",
+        "art": """
+  /---\\
+ |  _  |
+ | | | |
+ | |_| |
+ \\_____/
+  Scribe's Office
+""",
+        "description": "You are in your cozy office, surrounded by scrolls and maps. The scent of old parchment fills the air.",
+        "exits_text": "From here, you can venture into the '[bold magenta]Whispering Woods[/bold magenta]'.",
+        "go_hint": "You can go to the [bold magenta]Whispering Woods[/bold magenta]. Try '[bold green]go woods[/bold green]'",
+        "exits": {
+            "whispering woods": "whispering_woods",
+            "woods": "whispering_woods"
+        }
+    },
+    "whispering_woods": {
+        "name": "Whispering Woods",
+        "art": """
+   /\\_/\\\n  / _ \\ \\\n ( / \\ | )\n  \\ \\_/ /\n   \\___/\n  Whispering Woods
+""",
+        "description": "You are in the Whispering Woods. Tall, ancient trees loom over you, their leaves rustling with unseen secrets.",
+        "exits_text": "You can see a path leading '[bold magenta]back[/bold magenta]' to the Scribe's Office.",
+        "go_hint": "You can go [bold magenta]back[/bold magenta] to the Scribe's Office. Try '[bold green]go back[/bold green]'",
+        "exits": {
+            "back": "scribe_office",
+            "scribe office": "scribe_office",
+            "office": "scribe_office"
+        }
+    }
+}
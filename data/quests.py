@@ -3,6 +3,45 @@ quests = {
         "name": "The Whispering Woods",
         "description": "Investigate rumors of strange creatures in the Whispering Woods.",
         "reward": "50 gold",
-        "status": "available"
+        "status": "available",
+        "location": "whispering_woods",
+        "conditions": {
+            "document": ["goblin", "dire_wolf"]
+        },
+        "hints": [
+            {
+                "location": "scribe_office",
+                "status": "available",
+                "text": "A parchment on your desk details '[bold yellow]The Whispering Woods[/bold yellow]' quest. Perhaps you should 'take quest The Whispering Woods' or just 'take woods quest'."
+            },
+            {
+                "location": "scribe_office",
+                "status": "completed",
+                "text": "You have completed '[bold yellow]The Whispering Woods[/bold yellow]' quest. New quests may appear soon."
+            },
+            {
+                "location": "whispering_woods",
+                "status": "active",
+                "text": "You are currently on '[bold yellow]The Whispering Woods[/bold yellow]' quest."
+            },
+            {
+                "location": "whispering_woods",
+                "status": "active",
+                "unmet": {"document": "goblin"},
+                "text": "You sense small, scuttling creatures nearby. Perhaps you should '[bold green]document goblin[/bold green]'."
+            },
+            {
+                "location": "whispering_woods",
+                "status": "active",
+                "unmet": {"document": "dire_wolf"},
+                "text": "A low growl echoes through the trees. You might want to '[bold green]document dire wolf[/bold green]'."
+            },
+            {
+                "location": "whispering_woods",
+                "status": "active",
+                "ready": True,
+                "text": "You have documented all known creatures here. Perhaps it's time to '[bold green]complete woods quest[/bold green]'."
+            }
+        ]
     }
 }
@@ -0,0 +1,644 @@
+from collections import namedtuple
+
+from commands import CommandRegistry
+from listings import Listing, parse_filter
+from matching import MatchIndex, PrefixIndex
+from quest_rules import QuestRules
+from world import WorldGraph
+
+# Output event kinds. TEXT and PANEL carry a markup string, COLUMNS a list of
+# events shown side by side, PAGE a list of events shown one after another
+# (one page of a listing, which the app may draw a few at a time), EXIT the
+# farewell message. An event may also carry
+# a key that names what it shows (and the state version it reflects) so the
+# renderer can cache it.
+TEXT = "text"
+PANEL = "panel"
+COLUMNS = "columns"
+PAGE = "page"
+EXIT = "exit"
+
+OutputEvent = namedtuple("OutputEvent", ["kind", "value", "key"], defaults=[None])
+
+# Shown before anything else, so it needs no content loaded
+WELCOME_LINES = (
+    "Welcome, Scribe, to the World of Eldoria!",
+    "Your task is to document the creatures and lore of this land.",
+    "Choose your path wisely, for danger lurks in the shadows.",
+    "Type [bold green]help[/bold green] for a list of commands, or [bold cyan]h[/bold cyan] for quick help.",
+)
+
+
+class GameEngine:
+    """All of the game's state and rules, with no UI attached.
+
+    Commands go in as strings and come back out as a list of OutputEvents,
+    which the Textual app (or the headless runner) turns into output.
+    """
+
+    def __init__(self, quests=None, creatures=None, lore=None, locations=None, player_state=None,
+                 world=None, match_indexes=None, command_registry=None, quest_index=None):
+        if None in (quests, creatures, lore, locations):
+            # Missing collections come from the precompiled data/*.py snapshot
+            from content_snapshot import load_content
+            content, _ = load_content()
+            quests = content["quests"] if quests is None else quests
+            creatures = content["creatures"] if creatures is None else creatures
+            lore = content["lore"] if lore is None else lore
+            locations = content["locations"] if locations is None else locations
+
+        self.quests = quests
+        self.creatures = creatures
+        self.lore = lore
+        self.locations = locations
+        # Engines over the same read-only locations (e.g. server sessions) can share one graph
+        self.world = world or WorldGraph(locations)
+        # Engines over the same quests can share one QuestIndex and only keep their own progress
+        self.quest_rules = QuestRules(quests, creatures, lore, quest_index)
+
+        self.player_state = player_state or {
+            "name": "Scribe",
+            "gold": 100,
+            "inventory": [],
+            "current_location": "scribe_office"
+        }
+        self.running = True
+        # Bumped on every change to quest, creature or location state
+        self.state_version = 0
+        # When set, every set_state() call is also kept here for the save journal
+        self.record_changes = False
+        self.changes = []
+
+        # Name indexes for find_match, built lazily per data dict. Pass a
+        # shared dict to let engines over the same content share them.
+        self._match_indexes = {} if match_indexes is None else match_indexes
+        # Lowercased names for Tab completion: collection -> (data dict, size, PrefixIndex)
+        self._name_indexes = {}
+
+        self.command_registry = command_registry or self.build_command_registry()
+        self._output = []
+        # The creatures/lore/quests listing that "more" continues, until another command runs
+        self.listing = None
+        # Set by profiling.Profiler.instrument() while instrumentation is on
+        self.profiler = None
+
+    @classmethod
+    def fresh(cls, compact=False, packs=None):
+        """An engine with its own copy of the content, so runs don't share state.
+
+        With `compact`, quests, creatures and lore are kept in EntityTables
+        (see entity_store.py) instead of a dict per entry. `packs` is a
+        content_packs.ContentPacks to apply over the built-in content.
+        """
+        if not compact and packs is None:
+            # Every snapshot load builds new dicts, so this is already a private copy
+            return cls()
+        from content_snapshot import load_content
+        return cls.from_content(load_content()[0], compact, packs)
+
+    @classmethod
+    def from_store(cls, path, compact=False, packs=None):
+        """An engine whose content comes from a content store file (see content_store.py)"""
+        from content_store import ContentStore
+        content = ContentStore(path).load_all()
+        if not content["locations"]:
+            from content_snapshot import load_content
+            content["locations"] = load_content()[0]["locations"]
+        return cls.from_content(content, compact, packs)
+
+    @classmethod
+    def from_content(cls, content, compact=False, packs=None):
+        """An engine over a load_content()-style dict, after applying `packs` and compacting it"""
+        if packs is not None:
+            packs.load(content)
+        if compact:
+            from entity_store import compact_content
+            content = compact_content(content)
+        return cls(content["quests"], content["creatures"], content["lore"], content["locations"])
+
+    def content(self):
+        """The engine's collections by name"""
+        return {"quests": self.quests, "creatures": self.creatures, "lore": self.lore, "locations": self.locations}
+
+    def reload_entries(self, changes):
+        """Swap in edited content entries without losing the player's progress.
+
+        `changes` holds (collection, key, new entry or None to remove it), as
+        ContentPacks.poll() returns them. Entries that stay keep their saved
+        fields (quest status, documented, discovered) and their place in the
+        collection, and only the indexes and quest rules that mention the
+        changed keys are patched. Returns the OutputEvent keys whose cached
+        rendering is now out of date.
+        """
+        from persistence import SAVED_FIELDS
+        stale = set()
+        for collection, key, entry in changes:
+            data_dict = getattr(self, collection)
+            current = data_dict.get(key)
+            if current is None and entry is None:
+                continue
+            name_field = "title" if collection == "lore" else "name"
+            old_name = current[name_field].lower() if current is not None else None
+            if entry is None:
+                del data_dict[key]
+            else:
+                for field in SAVED_FIELDS.get(collection, ()) if current is not None else ():
+                    if field in current:
+                        entry[field] = current[field]
+                data_dict[key] = entry
+                entry = data_dict[key]
+
+            index = self._match_indexes.get(id(getattr(data_dict, "base", data_dict)))
+            if index is not None and index.data_dict is data_dict:
+                if entry is None:
+                    index.remove(key)
+                else:
+                    index.add(key, entry)
+            cached = self._name_indexes.get(collection)
+            if cached is not None and cached[0] is data_dict:
+                name_index = cached[2]
+                new_name = entry[name_field].lower() if entry is not None else None
+                if old_name != new_name:
+                    if old_name is not None:
+                        name_index.remove(old_name)
+                    if new_name is not None:
+                        name_index.add(new_name)
+                self._name_indexes[collection] = (data_dict, len(data_dict), name_index)
+
+            if collection == "quests":
+                if entry is None:
+                    self.quest_rules.remove_quest(key)
+                else:
+                    self.quest_rules.add_quest(key, entry)
+                # Quests waiting on this one completing
+                self.quest_rules.on_change("quests", key, "status")
+            elif collection == "locations":
+                self.world.invalidate(key)
+            else:
+                # Conditions waiting on an entry that came or went
+                for field in SAVED_FIELDS[collection]:
+                    self.quest_rules.on_change(collection, key, field)
+                stale.add(("creature" if collection == "creatures" else "lore", key))
+        if changes:
+            # Location screens are keyed on the version, and show quest hints and names
+            self.state_version += 1
+            # A listing part way through a collection can't carry on over the changed one
+            self.listing = None
+        return stale
+
+    def apply_change(self, collection, key, field, value):
+        """Set one field of game state. `collection` is "player" (key None),
+        "quests", "creatures" or "lore"."""
+        if collection == "player":
+            self.player_state[field] = value
+        else:
+            {"quests": self.quests, "creatures": self.creatures, "lore": self.lore}[collection][key][field] = value
+            self.quest_rules.on_change(collection, key, field)
+        self.state_version += 1
+
+    def set_state(self, collection, key, field, value):
+        """Change game state the way command handlers should, so it gets saved"""
+        self.apply_change(collection, key, field, value)
+        if self.record_changes:
+            self.changes.append((collection, key, field, value))
+
+    def take_changes(self):
+        changes, self.changes = self.changes, []
+        return changes
+
+    def emit(self, kind, value, key=None):
+        self._output.append(OutputEvent(kind, value, key))
+
+    def say(self, markup):
+        self.emit(TEXT, markup)
+
+    def show_panel(self, markup, key=None):
+        self.emit(PANEL, markup, key)
+
+    def show_columns(self, items, key=None):
+        self.emit(COLUMNS, [item if isinstance(item, OutputEvent) else OutputEvent(TEXT, item) for item in items], key)
+
+    def flush(self):
+        """Return the events produced since the last flush"""
+        output, self._output = self._output, []
+        return output
+
+    def welcome(self):
+        for line in WELCOME_LINES:
+            self.say(line)
+        self.command_look()
+        return self.flush()
+
+    def look(self):
+        self.command_look()
+        return self.flush()
+
+    def execute(self, command):
+        """Run one typed command and return its output events"""
+        command = command.lower().strip()
+        self.say(f"> {command}")
+
+        command = self.command_registry.expand_alias(command)
+        resolved, argument = self.parse(command)
+        if resolved is None or resolved.name != "more":
+            self.listing = None
+        if resolved is not None:
+            resolved.run(argument, self)
+        else:
+            # Improved error message with suggestions
+            self.say("[red]Unknown command. Type \'help\' for a list of commands.[/red]")
+            for suggestion in self.command_registry.suggest(command):
+                self.say(f"[yellow]{suggestion}[/yellow]")
+        return self.flush()
+
+    def parse(self, line):
+        """(Command, argument) for a cleaned-up input line, or (None, None)"""
+        return self.command_registry.resolve(line)
+
+    def match_index_for(self, data_dict):
+        """Get (or build) the name index for one of the data dicts"""
+        # A session Overlay (see overlay.py) has the same names as the content under it
+        data_dict = getattr(data_dict, "base", data_dict)
+        index = self._match_indexes.get(id(data_dict))
+        if index is None or index.data_dict is not data_dict:
+            index = MatchIndex(data_dict)
+            self._match_indexes[id(data_dict)] = index
+        else:
+            index.sync()
+        return index
+
+    @staticmethod
+    def keys_where(data_dict, field, value):
+        """Keys of the entries whose `field` is `value`, in data order"""
+        # An EntityTable answers from its bitsets instead of looking at every entry
+        where = getattr(data_dict, "where", None)
+        if where is not None:
+            return where(field, value)
+        return (key for key, item in data_dict.items() if item.get(field) == value)
+
+    def find_match(self, input_name, data_dict):
+        index = self.match_index_for(data_dict)
+        key, item = index.find(input_name)
+        if key is not None and index.data_dict is not data_dict:
+            # An Overlay hands out its session's view of the entry, not the shared one
+            item = data_dict[key]
+        return key, item
+
+    def complete(self, line, limit=None):
+        """Input lines that `line` can be completed to (Tab), sorted.
+
+        Completes the command name first, then the argument from the names
+        in the collection the command registered as `completes`.
+        """
+        head, index, rest = self.completion_source(line)
+        return [head + completion for completion in index.complete(rest, limit)]
+
+    def common_completion(self, line):
+        """What every completion of `line` starts with, or None if there are none"""
+        head, index, rest = self.completion_source(line)
+        common = index.common_prefix(rest)
+        return None if common is None else head + common
+
+    def completion_source(self, line):
+        """(text kept as is, PrefixIndex, text to complete) for an input line"""
+        line = line.lower().lstrip()
+        command, argument = self.command_registry.resolve(line)
+        if command is None or not command.completes:
+            return "", self.command_registry.name_index(), line
+        return command.name + " ", self.name_index_for(command.completes), argument
+
+    def name_index_for(self, collection):
+        """Get (or build) the completion index of one collection's names"""
+        data_dict = getattr(self, collection)
+        cached = self._name_indexes.get(collection)
+        if cached is not None and cached[0] is data_dict and cached[1] == len(data_dict):
+            return cached[2]
+        field = "title" if collection == "lore" else "name"
+        index = PrefixIndex(item[field].lower() for item in data_dict.values())
+        self._name_indexes[collection] = (data_dict, len(data_dict), index)
+        return index
+
+    def command_look(self):
+        current_location_key = self.player_state["current_location"]
+        location = self.locations.get(current_location_key)
+
+        if location is not None:
+            title_panel = OutputEvent(PANEL, f"[bold blue]{location["name"]}[/bold blue]")
+            art_panel = OutputEvent(PANEL, location["art"])
+            content = [title_panel, art_panel, location["description"], location["exits_text"]]
+            content.extend(self.location_hints(current_location_key))
+            self.show_columns(content, key=("location", current_location_key, self.state_version))
+        else:
+            self.show_panel("[bold red]Unknown Location[/bold red]")
+            self.say("You find yourself in a place unknown.")
+
+    def location_hints(self, location_key):
+        """Quest hints shown under a location's description"""
+        return self.quest_rules.hints_for(location_key)
+
+    def hint_take_quest(self):
+        """Suggest a quest to take (the 't' key binding)"""
+        self.say("> [dim](Key binding: take quest)[/dim]")
+        available_key = next((key for key in self.keys_where(self.quests, "status", "available")
+                              if self.quest_rules.can_take(key)), None)
+        if available_key is not None:
+            name = self.quests[available_key]["name"]
+            self.say(f"Available quest: [bold yellow]{name}[/bold yellow]. Try '[bold green]take quest {name}[/bold green]'")
+        else:
+            self.say("No available quests at the moment.")
+        return self.flush()
+
+    def hint_go(self):
+        """Suggest somewhere to go (the 'g' key binding)"""
+        self.say("> [dim](Key binding: go)[/dim]")
+        location = self.locations.get(self.player_state["current_location"])
+        if location is not None and "go_hint" in location:
+            self.say(location["go_hint"])
+        else:
+            self.say("You see no obvious way onward from here.")
+        return self.flush()
+
+    def hint_document_creature(self):
+        """Suggest a creature to document (the 'd' key binding)"""
+        self.say("> [dim](Key binding: document creature)[/dim]")
+        active_here, creature_key = self.quest_rules.next_unmet(self.player_state["current_location"], "document")
+        if active_here:
+            if creature_key in self.creatures:
+                name = self.creatures[creature_key]["name"]
+                self.say(f"You can document: [bold green]{name}[/bold green]. Try '[bold green]document creature {name.lower()}[/bold green]'")
+        else:
+            self.say("No obvious creatures to document here. Try '[bold green]creatures[/bold green]' to see what you've found.")
+        return self.flush()
+
+    @classmethod
+    def build_command_registry(cls):
+        """Register every typed command, alias, suggestion and help line.
+
+        Handlers are the unbound command_* methods and get the engine from
+        dispatch(), so engines over the same content can share one registry.
+        """
+        registry = CommandRegistry()
+        registry.register("look", cls.command_look,
+                          help="Describes your current location.")
+        registry.register("quests", cls.command_quests, aliases=["quest"], argument_optional=True,
+                          usage="quests [name | status STATUS]",
+                          help="Lists quests and their status, optionally only matching ones.")
+        registry.register("take quest", cls.command_take_quest, takes_argument=True, completes="quests",
+                          usage="take quest [quest name]", help="Attempts to take an available quest.")
+        registry.register("complete quest", cls.command_complete_quest, takes_argument=True, completes="quests",
+                          usage="complete quest [quest name]", help="Attempts to complete an active quest.")
+        registry.register("document creature", cls.command_document_creature, takes_argument=True, aliases=["doc"],
+                          completes="creatures",
+                          usage="document creature [creature name]",
+                          help="Attempts to document a creature in your current location.")
+        registry.register("creatures", cls.command_creatures, aliases=["creat"], argument_optional=True,
+                          usage="creatures [name | danger LEVEL]",
+                          help="Shows documented and undocumented creatures, optionally only matching ones.")
+        registry.register("lore", cls.command_lore, argument_optional=True,
+                          usage="lore [title]",
+                          help="Shows discovered and undiscovered lore entries, optionally only matching ones.")
+        registry.register("more", cls.command_more, aliases=["next"],
+                          help="Shows the next page of a long listing.")
+        registry.register("inventory", cls.command_inventory, aliases=["inv"],
+                          help="Displays your gold and items.")
+        registry.register("go", cls.command_go, takes_argument=True,
+                          usage="go [destination]", help="Moves you to a new location.")
+        registry.register("path to", cls.command_path_to, takes_argument=True, completes="locations",
+                          usage="path to [place]", help="Shows the shortest way to a place.")
+        registry.register("travel", cls.command_travel, takes_argument=True, completes="locations",
+                          usage="travel [place]", help="Travels to a place along the shortest way.")
+        registry.register("stats", cls.command_stats,
+                          help="Shows where command time goes.")
+        registry.register("help", cls.command_help, hidden=True)
+        registry.register("quit", cls.command_quit, aliases=["exit"],
+                          usage="quit/exit", help="Exits the game.")
+
+        # Checked in order, only the first hit is shown
+        registry.add_suggestion(["goblin", "wolf"], "Did you mean 'document creature goblin'?")
+        registry.add_suggestion(["wood"], "Did you mean 'go woods' or 'take quest The Whispering Woods'?")
+        registry.add_suggestion(["quest"], "Did you mean 'quests' or 'take quest [name]'?")
+        registry.add_suggestion(["creat"], "Did you mean 'creatures'?")
+        registry.add_suggestion(["doc"], "Did you mean 'document creature [name]'?")
+        registry.add_suggestion(["inv", "inven"], "Did you mean 'inventory'?")
+        registry.add_suggestion(["path", "trav"], "Did you mean 'path to [place]' or 'travel [place]'?")
+
+        registry.add_shortcut("↑/↓", "Navigate command history")
+        registry.add_shortcut("Ctrl+R", "Find the last command starting with what you've typed")
+        registry.add_shortcut("Tab", "Complete a command or name")
+        registry.add_shortcut("h", "Show this help")
+        registry.add_shortcut("q", "Quit")
+        registry.add_shortcut("l", "Look around")
+        registry.add_shortcut("i", "Inventory")
+        registry.add_shortcut("Q", "Quests")
+        registry.add_shortcut("C", "Creatures")
+        registry.add_shortcut("L", "Lore")
+        registry.add_shortcut("t", "Take a quest")
+        registry.add_shortcut("g", "Go somewhere")
+        registry.add_shortcut("d", "Document a creature")
+        return registry
+
+    def filtered_items(self, data_dict, argument, fields, name_field="name"):
+        """(matching (key, item) pairs, how many there are or None if that
+        would mean looking at them all) for a listing's filter argument"""
+        filters, name_filter = parse_filter(argument, fields)
+        if filters:
+            (field, value), = filters.items()
+            items = ((key, data_dict[key]) for key in self.keys_where(data_dict, field, value))
+            count = getattr(data_dict, "count", None)
+            total = count(field, value) if count is not None else None
+        else:
+            items = iter(data_dict.items())
+            total = len(data_dict)
+        if name_filter:
+            items = ((key, item) for key, item in items if name_filter in item[name_field].lower())
+            total = None
+        return items, total
+
+    def start_listing(self, noun, entries, total, argument):
+        """Show the first page of a listing and keep the rest for "more".
+
+        `entries` yields a list of OutputEvents per entry; only the ones on
+        a page are generated when it is shown.
+        """
+        self.listing = Listing(noun, entries, total)
+        if not self.show_page() and argument:
+            self.say(f"No {noun} match '{argument}'.")
+
+    def show_page(self):
+        """Emit the next page of the current listing. Returns whether it had any entries."""
+        events, more = self.listing.next_page()
+        if more:
+            events.append(OutputEvent(TEXT, self.listing.footer()))
+        else:
+            self.listing = None
+        if events:
+            self.emit(PAGE, events)
+        return bool(events)
+
+    def command_quests(self, argument):
+        self.say("\n--- Quests ---")
+        items, total = self.filtered_items(self.quests, argument, {"status": "status"})
+        entries = ([OutputEvent(TEXT, f"- {quest["name"]} ([bold green]{quest["status"]}[/bold green])")]
+                   for key, quest in items)
+        self.start_listing("quests", entries, total, argument)
+
+    def command_take_quest(self, quest_input):
+        quest_key, quest = self.find_match(quest_input, self.quests)
+
+        if quest:
+            if quest["status"] == "available" and not self.quest_rules.can_take(quest_key):
+                self.say(f"You are not ready for the quest [bold yellow]{quest["name"]}[/bold yellow] yet.")
+            elif quest["status"] == "available":
+                self.set_state("quests", quest_key, "status", "active")
+                self.say(f"You have taken the quest: [bold yellow]{quest["name"]}[/bold yellow].")
+            elif quest["status"] == "active":
+                self.say(f"You are already on the quest: [bold yellow]{quest["name"]}[/bold yellow].")
+            else:
+                self.say(f"The quest [bold yellow]{quest["name"]}[/bold yellow] is already {quest["status"]}.")
+        else:
+            self.say(f"[red]Quest \'{quest_input}\' not found.[/red]")
+
+    def command_document_creature(self, creature_input):
+        creature_key, creature = self.find_match(creature_input, self.creatures)
+
+        if creature:
+            if not creature["documented"]:
+                self.set_state("creatures", creature_key, "documented", True)
+                self.say(f"You have documented the [bold blue]{creature["name"]}[/bold blue].")
+                if "ascii_art" in creature:
+                    self.show_panel(creature["ascii_art"], key=("creature", creature_key))
+            else:
+                self.say(f"The [bold blue]{creature["name"]}[/bold blue] is already documented.")
+        else:
+            self.say(f"[red]Creature \'{creature_input}\' not found.[/red]")
+
+    def command_complete_quest(self, quest_input):
+        quest_key, quest = self.find_match(quest_input, self.quests)
+
+        if quest:
+            if quest["status"] == "active":
+                if self.quest_rules.is_ready(quest_key):
+                    reward = self.quest_rules.rewards[quest_key]
+                    self.set_state("quests", quest_key, "status", "completed")
+                    if reward.gold:
+                        self.set_state("player", None, "gold", self.player_state["gold"] + reward.gold)
+                    if reward.items:
+                        self.set_state("player", None, "inventory", self.player_state["inventory"] + list(reward.items))
+                    self.say(f"You have completed the quest: [bold yellow]{quest["name"]}[/bold yellow]. You received [bold green]{reward.text}[/bold green].")
+                else:
+                    self.say(f"[red]{self.quest_rules.blocked_message(quest_key, quest["name"])}[/red]")
+            elif quest["status"] == "completed":
+                self.say(f"The quest [bold yellow]{quest["name"]}[/bold yellow] is already completed.")
+            else:
+                self.say(f"The quest [bold yellow]{quest["name"]}[/bold yellow] is not active.")
+        else:
+            self.say(f"[red]Quest \'{quest_input}\' not found.[/red]")
+
+    @staticmethod
+    def creature_entry(key, creature):
+        if not creature["documented"]:
+            return [OutputEvent(TEXT, f"- [bold blue]{creature["name"]}[/bold blue]: [italic red]Undocumented[/italic red]")]
+        events = [OutputEvent(TEXT, f"- [bold blue]{creature["name"]}[/bold blue]: {creature["description"]}")]
+        if "ascii_art" in creature:
+            events.append(OutputEvent(PANEL, creature["ascii_art"], ("creature", key)))
+        return events
+
+    @staticmethod
+    def lore_entry(key, lore_item):
+        if not lore_item["discovered"]:
+            return [OutputEvent(TEXT, f"- [bold magenta]{lore_item["title"]}[/bold magenta]: [italic red]Undiscovered[/italic red]")]
+        events = [OutputEvent(TEXT, f"- [bold magenta]{lore_item["title"]}[/bold magenta]: {lore_item["text"]}")]
+        if "ascii_art" in lore_item:
+            events.append(OutputEvent(PANEL, lore_item["ascii_art"], ("lore", key)))
+        return events
+
+    def command_creatures(self, argument):
+        self.say("\n--- Documented Creatures ---")
+        items, total = self.filtered_items(self.creatures, argument, {"danger": "danger_level"})
+        self.start_listing("creatures", (self.creature_entry(key, creature) for key, creature in items),
+                           total, argument)
+
+    def command_lore(self, argument):
+        self.say("\n--- Discovered Lore ---")
+        items, total = self.filtered_items(self.lore, argument, {}, name_field="title")
+        self.start_listing("lore entries", (self.lore_entry(key, lore_item) for key, lore_item in items),
+                           total, argument)
+
+    def command_more(self):
+        if self.listing is None:
+            self.say("Nothing more to show. Try '[bold green]creatures[/bold green]', "
+                     "'[bold green]lore[/bold green]' or '[bold green]quests[/bold green]'.")
+            return
+        self.show_page()
+
+    def command_inventory(self):
+        self.say("\n--- Inventory ---")
+        if self.player_state["inventory"]:
+            for item in self.player_state["inventory"]:
+                self.say(f"- {item}")
+        else:
+            self.say("Your inventory is empty.")
+        self.say(f"Gold: [bold yellow]{self.player_state["gold"]}[/bold yellow]")
+
+    def command_go(self, destination):
+        matched_destination = self.world.resolve_exit(self.player_state["current_location"], destination)
+
+        if matched_destination:
+            self.set_state("player", None, "current_location", matched_destination)
+            self.command_look()
+        else:
+            self.say("[red]You cannot go that way from here.[/red]")
+
+    def find_route(self, place_input):
+        """Shortest path from here to the place the player named, or None after explaining why"""
+        place_key, place = self.find_match(place_input, self.locations)
+        if not place:
+            self.say(f"[red]Place \'{place_input}\' not found.[/red]")
+            return None
+        current_location = self.player_state["current_location"]
+        if place_key == current_location:
+            self.say(f"You are already in the [bold magenta]{place["name"]}[/bold magenta].")
+            return None
+        route = self.world.shortest_path(current_location, place_key)
+        if route is None:
+            self.say(f"[red]You know of no way to the {place["name"]} from here.[/red]")
+        return route
+
+    def location_name(self, location_key):
+        location = self.locations.get(location_key)
+        return location["name"] if location is not None else location_key
+
+    @staticmethod
+    def plural(count, noun):
+        return f"{count} {noun}" if count == 1 else f"{count} {noun}s"
+
+    def command_path_to(self, place_input):
+        route = self.find_route(place_input)
+        if route:
+            steps = " -> ".join(self.location_name(key) for key in route)
+            self.say(f"The way to [bold magenta]{self.location_name(route[-1])}[/bold magenta] ({self.plural(len(route) - 1, "step")}): {steps}")
+
+    def command_travel(self, place_input):
+        route = self.find_route(place_input)
+        if route:
+            self.say(f"You travel to [bold magenta]{self.location_name(route[-1])}[/bold magenta] ({self.plural(len(route) - 1, "step")}).")
+            self.set_state("player", None, "current_location", route[-1])
+            self.command_look()
+
+    def command_stats(self):
+        self.say("\n--- Stats ---")
+        if self.profiler is not None:
+            for line in self.profiler.stats_lines():
+                self.say(line)
+            return
+        for name, calls, total, mean in self.command_registry.timings():
+            self.say(f"- {name}: {self.plural(calls, "call")}, {mean * 1000:.3f} ms each")
+        self.say("[dim]For a per-phase breakdown, start with --profile FILE or MYTHIC_SCRIBE_PROFILE=FILE.[/dim]")
+
+    def command_help(self):
+        for line in self.command_registry.help_lines():
+            self.say(line)
+
+    def command_quit(self):
+        self.running = False
+        self.emit(EXIT, "Farewell, Scribe.")
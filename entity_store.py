@@ -0,0 +1,256 @@
+"""Compact, column-per-field storage for large collections of entries.
+
+An EntityTable holds one collection (creatures, quests, lore...) and looks
+like the plain {key: entry dict} the engine expects, but stores each field
+as a column instead of a dict per entry:
+
+    creatures = EntityTable(data.creatures.creatures)
+    creatures["goblin"]["documented"] = True      # updates the column
+    creatures.first("documented", False)          # key of the first undocumented creature
+    list(creatures.where("status", "available"))  # keys in data order
+
+Small-valued fields (ENUM_FIELDS: status, danger level and the documented
+and discovered flags) are stored as one byte per entry, an index into the
+field's interned values, plus one bitset per value. A bitset is a Python
+int with bit n set when entry n has that value, so first() is a lowest-bit
+lookup, count() is a popcount and where() finds the matching entries with
+a C-level pass over the bitset, running Python code only per match. Other fields are plain lists with MISSING where an entry has no
+such field.
+
+Entries are handed out as EntityRecords, short-lived views of one row, so
+code that reads item["field"], "field" in item and item.get("field") works
+unchanged.
+"""
+from array import array
+from collections.abc import MutableMapping
+
+# Fields stored as interned codes with a bitset per value
+ENUM_FIELDS = ("status", "danger_level", "documented", "discovered")
+
+# An enum field can take at most this many distinct values (one byte per code)
+MAX_ENUM_VALUES = 255
+
+# Code 0 of every enum field: the entry has no value for it
+MISSING = object()
+
+
+class EnumColumn:
+    """One byte per row pointing into `values`, and a bitset of rows per value"""
+
+    __slots__ = ("values", "codes", "rows", "_code_of")
+
+    def __init__(self, values=()):
+        self.values = [MISSING]      # code -> value
+        self._code_of = {}           # value -> code, MISSING excluded
+        self.rows = [0]              # code -> bitset of rows
+        self.codes = array("B", (self.code(value) for value in values))   # row -> code
+        # Build the bitsets a byte at a time, since or-ing bits into an int
+        # one row at a time copies the whole int every time
+        masks = [bytearray((len(self.codes) + 7) // 8) for _ in self.values]
+        for row, code in enumerate(self.codes):
+            masks[code][row >> 3] |= 1 << (row & 7)
+        self.rows = [int.from_bytes(mask, "little") for mask in masks]
+
+    def code(self, value, create=True):
+        if value is MISSING:
+            return 0
+        code = self._code_of.get(value)
+        if code is None and create:
+            if len(self.values) > MAX_ENUM_VALUES:
+                raise ValueError(f"more than {MAX_ENUM_VALUES} distinct values")
+            code = self._code_of[value] = len(self.values)
+            self.values.append(value)
+            self.rows.append(0)
+        return code
+
+    def append(self, value):
+        code = self.code(value)
+        self.rows[code] |= 1 << len(self.codes)
+        self.codes.append(code)
+
+    def get(self, row):
+        return self.values[self.codes[row]]
+
+    def set(self, row, value):
+        old, new = self.codes[row], self.code(value)
+        if old != new:
+            bit = 1 << row
+            self.rows[old] &= ~bit
+            self.rows[new] |= bit
+            self.codes[row] = new
+
+
+class EntityRecord(MutableMapping):
+    """One entry of an EntityTable"""
+
+    __slots__ = ("_table", "_row")
+
+    def __init__(self, table, row):
+        self._table = table
+        self._row = row
+
+    def __getitem__(self, field):
+        value = self._table.get_field(self._row, field)
+        if value is MISSING:
+            raise KeyError(field)
+        return value
+
+    def __setitem__(self, field, value):
+        self._table.set_field(self._row, field, value)
+
+    def __delitem__(self, field):
+        if field not in self:
+            raise KeyError(field)
+        self._table.set_field(self._row, field, MISSING)
+
+    def __contains__(self, field):
+        return self._table.get_field(self._row, field) is not MISSING
+
+    def get(self, field, default=None):
+        value = self._table.get_field(self._row, field)
+        return default if value is MISSING else value
+
+    def __iter__(self):
+        return (field for field in self._table.fields if field in self)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"EntityRecord({dict(self)!r})"
+
+
+class EntityTable(MutableMapping):
+    """One collection of entries stored as columns, in insertion order.
+
+    `entries` is a {key: entry dict} mapping of plain dicts (data/*.py or a
+    content snapshot); every field of every entry is copied into the columns.
+    """
+
+    def __init__(self, entries=None, enum_fields=ENUM_FIELDS):
+        entries = entries or {}
+        self.enum_fields = frozenset(enum_fields)
+        self._keys = list(entries)                                  # row -> key, None once deleted
+        self._rows = {key: row for row, key in enumerate(self._keys)}
+        self._live = (1 << len(self._keys)) - 1                     # bitset of rows not deleted
+        # every field any entry has had, in first-seen order
+        self.fields = list(dict.fromkeys(field for entry in entries.values() for field in entry))
+        self._columns = {}                                          # field -> list of values, or EnumColumn
+        for field in self.fields:
+            values = [entry.get(field, MISSING) for entry in entries.values()]
+            self._columns[field] = EnumColumn(values) if field in self.enum_fields else values
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __iter__(self):
+        return iter(self._rows)
+
+    def __contains__(self, key):
+        return key in self._rows
+
+    def __getitem__(self, key):
+        return EntityRecord(self, self._rows[key])
+
+    def __setitem__(self, key, entry):
+        """Add an entry, or replace every field of an existing one"""
+        row = self._rows.get(key)
+        if row is None:
+            row = len(self._keys)
+            self._keys.append(key)
+            self._rows[key] = row
+            self._live |= 1 << row
+            for column in self._columns.values():
+                column.append(MISSING)
+        else:
+            for field in self.fields:
+                self.set_field(row, field, MISSING)
+        for field, value in entry.items():
+            self.set_field(row, field, value)
+
+    def __delitem__(self, key):
+        row = self._rows.pop(key)
+        for field in self.fields:
+            self.set_field(row, field, MISSING)
+        self._keys[row] = None
+        self._live &= ~(1 << row)
+
+    def _column(self, field):
+        column = self._columns.get(field)
+        if column is None:
+            if field in self.enum_fields:
+                column = EnumColumn([MISSING] * len(self._keys))
+            else:
+                column = [MISSING] * len(self._keys)
+            self._columns[field] = column
+            self.fields.append(field)
+        return column
+
+    def get_field(self, row, field):
+        column = self._columns.get(field)
+        if column is None:
+            return MISSING
+        if isinstance(column, EnumColumn):
+            return column.get(row)
+        return column[row]
+
+    def set_field(self, row, field, value):
+        if value is MISSING and field not in self._columns:
+            return
+        column = self._column(field)
+        if isinstance(column, EnumColumn):
+            column.set(row, value)
+        else:
+            column[row] = value
+
+    def _bitset(self, field, value):
+        column = self._columns.get(field)
+        if column is None:
+            # No entry has had the field yet (or the table is empty): nothing matches
+            return 0
+        if not isinstance(column, EnumColumn):
+            raise KeyError(f"{field!r} is not an enum field of this table")
+        code = column.code(value, create=False)
+        if code is None:
+            return 0
+        return column.rows[code] & self._live
+
+    def count(self, field, value):
+        """How many entries have `field` equal to `value`"""
+        return self._bitset(field, value).bit_count()
+
+    def first(self, field, value):
+        """Key of the first entry (in insertion order) with `field` equal to `value`, or None"""
+        rows = self._bitset(field, value)
+        if not rows:
+            return None
+        return self._keys[(rows & -rows).bit_length() - 1]
+
+    def where(self, field, value):
+        """Keys of the entries with `field` equal to `value`, in insertion order.
+
+        Finding them is one pass over the bitset in C (bin() and rfind()),
+        then Python work per match only.
+        """
+        rows = self._bitset(field, value)
+        if not rows:
+            return
+        # bin() puts row 0 last, so walk its "1"s from the end with rfind,
+        # which skips the unset rows in C
+        bits = bin(rows)
+        last = len(bits) - 1
+        position = bits.rfind("1")
+        while position > 1:
+            yield self._keys[last - position]
+            position = bits.rfind("1", 2, position)
+
+
+def compact_content(content, collections=("quests", "creatures", "lore")):
+    """Turn the given collections of a load_content()-style dict into EntityTables"""
+    compacted = dict(content)
+    for name in collections:
+        entries = content[name]
+        # Content store entries keep long fields out of their keys until read
+        compacted[name] = EntityTable({key: entry.materialize() if hasattr(entry, "materialize") else entry
+                                       for key, entry in entries.items()})
+    return compacted
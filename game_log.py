@@ -0,0 +1,244 @@
+"""A bounded, virtualized replacement for RichLog.
+
+GameLog keeps the most recent lines in memory as rendered Strips, along with
+the entries they came from so they can be reflowed when the width changes.
+An entry with an at_width(width) method (render_cache.CachedRender) is asked
+for a renderable at the width being laid out, on every write and reflow.
+Older lines are paged out to a temporary file as compact JSON records and
+read back (through a small cache) only when scrolled into view. Only the
+visible window is ever cropped and styled for display.
+"""
+import json
+import tempfile
+from array import array
+from collections import deque
+from functools import lru_cache
+
+from rich.measure import measure_renderables
+from rich.segment import Segment
+from rich.style import Style
+from rich.text import Text
+from textual.cache import LRUCache
+from textual.geometry import Size
+from textual.scroll_view import ScrollView
+from textual.strip import Strip
+
+
+@lru_cache(maxsize=1024)
+def _parse_style(definition):
+    return Style.parse(definition)
+
+
+class PagedLines:
+    """Append-only store of Strips in a temporary file, one JSON record per line"""
+
+    def __init__(self, cache_size=512):
+        self._file = tempfile.TemporaryFile()
+        self._offsets = array("Q")
+        self._end = 0
+        self._cache = LRUCache(cache_size)
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def extend(self, strips):
+        records = []
+        for strip in strips:
+            record = [[segment.text, str(segment.style) if segment.style else None]
+                      for segment in strip if not segment.control]
+            encoded = (json.dumps(record, separators=(",", ":")) + "\n").encode("utf-8")
+            self._offsets.append(self._end)
+            self._end += len(encoded)
+            records.append(encoded)
+        self._file.seek(0, 2)
+        self._file.write(b"".join(records))
+
+    def __getitem__(self, index):
+        strip = self._cache.get(index)
+        if strip is None:
+            self._file.seek(self._offsets[index])
+            record = json.loads(self._file.readline())
+            strip = Strip([Segment(text, _parse_style(style) if style else None) for text, style in record])
+            self._cache[index] = strip
+        return strip
+
+    def close(self):
+        self._file.close()
+
+
+class GameLog(ScrollView, can_focus=True):
+    """A scrolling log that keeps at most `max_lines` rendered lines in memory"""
+
+    DEFAULT_CSS = """
+    GameLog {
+        background: $surface;
+        color: $foreground;
+        overflow-y: scroll;
+        &:focus {
+            background-tint: $foreground 5%;
+        }
+    }
+    """
+
+    def __init__(self, *, max_lines=10_000, min_width=78, markup=False, auto_scroll=True,
+                 name=None, id=None, classes=None, disabled=False):
+        super().__init__(name=name, id=id, classes=classes, disabled=disabled)
+        self.max_lines = max_lines
+        self.min_width = min_width
+        self.markup = markup
+        self.auto_scroll = auto_scroll
+
+        self.lines = []                 # Strips for the in-memory window, oldest first
+        self._entries = deque()         # [content, line count] for each entry in the window
+        self._paged = None              # PagedLines, created on the first page-out
+        self._paged_count = 0
+        self._widest_line_width = 0
+        self._layout_width = 0          # content width the window was rendered for
+        self._line_cache = LRUCache(1024)
+        self._generation = 0            # bumped on reflow so cached crops are dropped
+        self._size_known = False
+        self._deferred_writes = deque()
+        self._reflow_timer = None
+        self.lines_written = 0
+
+    def __len__(self):
+        return self._paged_count + len(self.lines)
+
+    @property
+    def paged_line_count(self):
+        return self._paged_count
+
+    def on_unmount(self):
+        if self._paged is not None:
+            self._paged.close()
+
+    def on_resize(self, event):
+        if not event.size.width:
+            return
+        if not self._size_known:
+            self._size_known = True
+            self._layout_width = self.scrollable_content_region.width
+            while self._deferred_writes:
+                self.write(*self._deferred_writes.popleft())
+        elif self.scrollable_content_region.width != self._layout_width:
+            # Resizes tend to come in bursts; reflow once they settle
+            if self._reflow_timer is not None:
+                self._reflow_timer.stop()
+            self._reflow_timer = self.set_timer(0.1, self._reflow)
+
+    def _make_renderable(self, content, width):
+        if hasattr(content, "at_width"):
+            return content.at_width(width)
+        if isinstance(content, str):
+            text = Text.from_markup(content) if self.markup else Text(content)
+            text.expand_tabs()
+            return text
+        return content
+
+    def _render(self, content, container_width):
+        """Render an entry the way RichLog.write(content) would, returning Strips"""
+        renderable = self._make_renderable(content, container_width)
+        console = self.app.console
+        options = console.options
+        if isinstance(renderable, Text):
+            options = options.update(overflow="ignore", no_wrap=True)
+
+        render_width = measure_renderables(console, options, [renderable]).maximum
+        render_width = max(min(render_width, container_width), self.min_width)
+
+        lines = list(Segment.split_lines(console.render(renderable, options.update_width(render_width))))
+        if not lines:
+            return [Strip.blank(render_width)]
+        strips = Strip.from_lines(lines)
+        for strip in strips:
+            strip.adjust_cell_length(render_width)
+        return strips
+
+    def write(self, content, scroll_end=None):
+        """Write a string or Rich renderable to the bottom of the log"""
+        if not self._size_known:
+            self._deferred_writes.append((content, scroll_end))
+            return self
+
+        strips = self._render(content, self._layout_width)
+        # Strings are kept as-is rather than as Text: smaller, and cheap to redo
+        self._entries.append([content, len(strips)])
+        self.lines.extend(strips)
+        self.lines_written += len(strips)
+        self._widest_line_width = max(self._widest_line_width, max(strip.cell_length for strip in strips))
+
+        if len(self.lines) > self.max_lines:
+            self._page_out()
+
+        self.virtual_size = Size(self._widest_line_width, len(self))
+        if self.auto_scroll if scroll_end is None else scroll_end:
+            self.scroll_end(animate=False, immediate=False, x_axis=False)
+        return self
+
+    def _page_out(self):
+        # Drop a quarter of the window at a time so paging is amortized
+        target = self.max_lines - self.max_lines // 4
+        count = 0
+        while self._entries and len(self.lines) - count > target:
+            count += self._entries.popleft()[1]
+        if not count:
+            return
+        if self._paged is None:
+            self._paged = PagedLines()
+        self._paged.extend(self.lines[:count])
+        del self.lines[:count]
+        self._paged_count += count
+
+    def _reflow(self):
+        """Re-render the in-memory window at the current width"""
+        self._reflow_timer = None
+        width = self.scrollable_content_region.width
+        if not width or width == self._layout_width:
+            return
+        at_end = self.scroll_offset.y >= self.max_scroll_y
+        self._layout_width = width
+        self.lines = []
+        for entry in self._entries:
+            strips = self._render(entry[0], width)
+            entry[1] = len(strips)
+            self.lines.extend(strips)
+        self._widest_line_width = max((strip.cell_length for strip in self.lines), default=0)
+        self._generation += 1
+        self._line_cache.clear()
+        self.virtual_size = Size(self._widest_line_width, len(self))
+        if at_end:
+            self.scroll_end(animate=False, immediate=False, x_axis=False)
+        self.refresh()
+
+    def get_line(self, index):
+        """The Strip for absolute line `index`, reading paged-out lines back from disk"""
+        if index < self._paged_count:
+            return self._paged[index]
+        return self.lines[index - self._paged_count]
+
+    def clear(self):
+        self.lines = []
+        self._entries.clear()
+        if self._paged is not None:
+            self._paged.close()
+            self._paged = None
+        self._paged_count = 0
+        self._widest_line_width = 0
+        self._deferred_writes.clear()
+        self._line_cache.clear()
+        self.virtual_size = Size(0, 0)
+        self.refresh()
+        return self
+
+    def render_line(self, y):
+        scroll_x, scroll_y = self.scroll_offset
+        index = scroll_y + y
+        width = self.scrollable_content_region.width
+        if index >= len(self):
+            return Strip.blank(width, self.rich_style)
+        key = (index, scroll_x, width, self._generation)
+        line = self._line_cache.get(key)
+        if line is None:
+            line = self.get_line(index).crop_extend(scroll_x, scroll_x + width, self.rich_style)
+            self._line_cache[key] = line
+        return line.apply_style(self.rich_style)
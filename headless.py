@@ -0,0 +1,116 @@
+"""Play Mythic Scribe without a terminal UI.
+
+Replays command scripts (one command per line, blank lines and lines
+starting with # are skipped) through GameEngine and prints the output as
+plain text:
+
+    python headless.py script.txt [more.txt ...]
+    python headless.py < script.txt
+    python headless.py --quiet --repeat 1000 script.txt
+"""
+import argparse
+import sys
+import time
+
+from content_packs import ContentPacks
+from engine import GameEngine, COLUMNS, PAGE
+from persistence import SaveGame
+from profiling import Profiler
+
+
+def event_lines(event):
+    if event.kind in (COLUMNS, PAGE):
+        for item in event.value:
+            yield from event_lines(item)
+    else:
+        yield str(event.value)
+
+
+def read_script(stream):
+    commands = []
+    for line in stream:
+        line = line.strip()
+        if line and not line.startswith("#"):
+            commands.append(line)
+    return commands
+
+
+def replay(commands, engine=None, out=None, save=None):
+    """Run commands through an engine, stopping early if the game quits.
+
+    With a SaveGame, progress is autosaved after every command.
+    Returns the number of commands run.
+    """
+    engine = engine or GameEngine.fresh()
+    events = engine.welcome()
+    count = 0
+    for command in commands:
+        if out is not None:
+            for event in events:
+                out.writelines(line + "\n" for line in event_lines(event))
+        if not engine.running:
+            break
+        events = engine.execute(command)
+        if save is not None:
+            save.autosave(engine)
+        count += 1
+    if out is not None:
+        for event in events:
+            out.writelines(line + "\n" for line in event_lines(event))
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay Mythic Scribe command scripts without the TUI.")
+    parser.add_argument("scripts", nargs="*", help="command script files (default: stdin)")
+    parser.add_argument("--quiet", action="store_true", help="don't print game output")
+    parser.add_argument("--content", help="load content from a content store file instead of data/*.py")
+    parser.add_argument("--compact", action="store_true", help="keep quests, creatures and lore in compact column tables (for large bestiaries)")
+    parser.add_argument("--pack", action="append", default=[],
+                        help="apply the content pack in this directory (repeatable; later packs win)")
+    parser.add_argument("--save", help="load progress from and autosave it to this save file")
+    parser.add_argument("--profile", help="time every command and write a report here on exit "
+                                          "(a cProfile dump if it ends in .prof, JSON otherwise)")
+    parser.add_argument("--repeat", type=int, default=1, help="replay each script this many times")
+    args = parser.parse_args(argv)
+
+    scripts = []
+    if args.scripts:
+        for path in args.scripts:
+            with open(path, encoding="utf-8") as f:
+                scripts.append(read_script(f))
+    else:
+        scripts.append(read_script(sys.stdin))
+
+    out = None if args.quiet else sys.stdout
+    profiler = Profiler.from_environment(args.profile)
+    start = time.perf_counter()
+    total = 0
+    for commands in scripts:
+        for _ in range(args.repeat):
+            packs = ContentPacks(args.pack) if args.pack else None
+            if args.content:
+                engine = GameEngine.from_store(args.content, args.compact, packs)
+            else:
+                engine = GameEngine.fresh(args.compact, packs)
+            for error in packs.errors if packs is not None else ():
+                print(error, file=sys.stderr)
+            if profiler is not None:
+                profiler.instrument(engine)
+            save = None
+            if args.save:
+                save = SaveGame(args.save)
+                save.load(engine)
+                save.attach(engine)
+            total += replay(commands, engine, out=out, save=save)
+            if save is not None:
+                save.close()
+    elapsed = time.perf_counter() - start
+    if profiler is not None:
+        profiler.close()
+    print(f"{total} commands in {elapsed:.3f}s ({total / elapsed if elapsed else 0:.0f} commands/s)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,174 @@
+"""Command history that survives restarts, with prefix search.
+
+The history file is append-only text. The first line is a header naming
+the format and version, and every other line is one command as typed:
+
+    {"format": "mythic-scribe-history", "version": 1}
+    take quest the whispering woods
+    go woods
+
+Running a command again moves it to the end of the history rather than
+adding a second entry. The file still gets the repeat appended, and loading
+keeps each command's last occurrence. Once the file holds twice as many lines
+as the history keeps, it is rewritten with just the live entries.
+"""
+from line_files import header_line, open_append, read_header, rewrite
+from matching import PrefixIndex
+
+FORMAT = "mythic-scribe-history"
+VERSION = 1
+
+# search() picks the newest match out of the prefix range directly when the
+# range is at most this long, and otherwise walks the history from the newest end
+SCAN_LIMIT = 256
+
+
+def _header():
+    return header_line(format=FORMAT, version=VERSION)
+
+
+class CommandHistory:
+    """The last `max_entries` distinct commands, oldest first.
+
+    previous()/next() step through them like the up/down arrows, and
+    search() finds the newest command starting with a prefix (Ctrl-R).
+    With a `path`, the history is loaded from and appended to that file.
+    """
+
+    def __init__(self, path=None, max_entries=10_000):
+        self.path = path
+        self.max_entries = max_entries
+        self.index = PrefixIndex()
+        self._log = []           # position -> command, None once it moved or was dropped
+        self._positions = {}     # command -> its position in _log
+        self._start = 0          # no live entries before this position
+        self._cursor = 0         # previous()/next() position, len(_log) when not browsing
+        self._file = None
+        self.file_length = 0
+
+    def __len__(self):
+        return len(self._positions)
+
+    def __iter__(self):
+        return (command for command in self._log[self._start:] if command is not None)
+
+    def load(self):
+        """Read the history file, if there is one. Returns the entry count."""
+        if self.path is None:
+            return 0
+        try:
+            f = open(self.path, encoding="utf-8")
+        except FileNotFoundError:
+            return 0
+        with f:
+            read_header(f, self.path, "history file", FORMAT, VERSION)
+            lines = 0
+            for line in f:
+                command = line.strip()
+                if command:
+                    self._remember(command, index=False)
+                lines += 1
+        # One sort is much cheaper than an insort per line
+        self.index = PrefixIndex(self._positions)
+        self.file_length = lines
+        return len(self)
+
+    def add(self, command):
+        """Record a command that was just run and save it to the history file"""
+        command = command.strip()
+        if not command:
+            return
+        self._remember(command)
+        if self.path is not None:
+            self._open_file().write(command + "\n")
+            self._file.flush()
+            self.file_length += 1
+            if self.file_length >= 2 * self.max_entries:
+                self.compact()
+
+    def _remember(self, command, index=True):
+        position = self._positions.get(command)
+        if position is not None:
+            self._log[position] = None
+        elif index:
+            self.index.add(command)
+        self._positions[command] = len(self._log)
+        self._log.append(command)
+        while len(self._positions) > self.max_entries:
+            self._drop_oldest(index)
+        if len(self._log) > 2 * len(self._positions) + 64:
+            self._pack()
+        self._cursor = len(self._log)
+
+    def _drop_oldest(self, index=True):
+        while self._log[self._start] is None:
+            self._start += 1
+        command = self._log[self._start]
+        self._log[self._start] = None
+        del self._positions[command]
+        if index:
+            self.index.remove(command)
+
+    def _pack(self):
+        """Close the gaps left by moved and dropped commands"""
+        self._log = list(self)
+        self._positions = {command: position for position, command in enumerate(self._log)}
+        self._start = 0
+
+    def _open_file(self):
+        if self._file is None:
+            self._file = open_append(self.path, _header())
+        return self._file
+
+    def compact(self):
+        """Rewrite the history file with only the live entries"""
+        rewrite(self.path, _header(), (command + "\n" for command in self))
+        self.close()
+        self.file_length = len(self)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def previous(self):
+        """The command before the one last returned (up arrow), or "" at the start"""
+        position = self._cursor - 1
+        while position >= self._start and self._log[position] is None:
+            position -= 1
+        if position < self._start:
+            return ""
+        self._cursor = position
+        return self._log[position]
+
+    def next(self):
+        """The command after the one last returned (down arrow), or "" past the end"""
+        position = self._cursor + 1
+        while position < len(self._log) and self._log[position] is None:
+            position += 1
+        self._cursor = min(position, len(self._log))
+        return self._log[position] if position < len(self._log) else ""
+
+    def search(self, prefix, before=None):
+        """The newest command starting with prefix, as (command, position).
+
+        Pass the position of the last result as `before` to get the next
+        older match. Returns (None, None) when there are no more.
+        """
+        if before is None:
+            before = len(self._log)
+        lo, hi = self.index.range(prefix)
+        if hi - lo <= SCAN_LIMIT:
+            best = -1
+            for command in self.index.items[lo:hi]:
+                position = self._positions[command]
+                if best < position < before:
+                    best = position
+            return (self._log[best], best) if best >= 0 else (None, None)
+        # Plenty of matches, so one is never far from the newest end
+        log = self._log
+        for position in range(min(before, len(log)) - 1, self._start - 1, -1):
+            command = log[position]
+            if command is not None and command.startswith(prefix):
+                return command, position
+        return None, None
@@ -0,0 +1,68 @@
+"""Append-only text files of one record per line, after a JSON header line.
+
+The save journal (persistence.py) and the command history (history.py)
+are both kept this way:
+
+    {"format": "mythic-scribe-history", "version": 1}
+    take quest the whispering woods
+
+The header names the format and version so a file of the wrong kind is
+refused instead of misread. Records are appended as they happen, and the
+file is rewritten in one piece (a temp file, then os.replace) when it is
+compacted.
+"""
+import json
+import os
+
+
+def header_line(**fields):
+    return json.dumps(fields) + "\n"
+
+
+def read_header(f, path, what, format, version, **fields):
+    """Read the header line of an open file and check it.
+
+    `what` names the kind of file in errors ("history file"); `fields` are
+    other header fields that must match, such as a save file's "kind".
+    """
+    try:
+        header = json.loads(f.readline())
+    except ValueError:
+        header = None
+    if (not isinstance(header, dict) or header.get("format") != format
+            or any(header.get(name) != value for name, value in fields.items())):
+        raise ValueError(f"{path} is not a {what}")
+    if header.get("version") != version:
+        raise ValueError(f"{path} is {what} version {header.get('version')}, expected {version}")
+    return header
+
+
+def open_append(path, header):
+    """Open a line file for appending, writing `header` if it is new"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    try:
+        with open(path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            last = f.read(1)
+    except (FileNotFoundError, OSError):
+        last = None
+    file = open(path, "a", encoding="utf-8")
+    if last is None:
+        file.write(header)
+    elif last != b"\n":
+        # Finish a line torn by a crash so it doesn't swallow the next one
+        file.write("\n")
+    return file
+
+
+def rewrite(path, header, lines, fsync=False):
+    """Replace the file with `header` and `lines` (each ending in a newline) in one step"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    temp_path = path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        f.write(header)
+        f.writelines(lines)
+        if fsync:
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(temp_path, path)
@@ -0,0 +1,51 @@
+"""Long listings handed out a page at a time.
+
+The creatures, lore and quests commands build a Listing from a generator
+that yields each entry's output events. Only the entries on the page being
+shown are ever generated, so the first page costs the same however large
+the collection is, and a listing that is abandoned halfway never looks at
+the rest.
+"""
+from itertools import islice
+
+# Entries shown per page
+PAGE_SIZE = 20
+
+
+class Listing:
+    """Pages of a listing. `entries` yields one list of OutputEvents per entry."""
+
+    def __init__(self, noun, entries, total=None, page_size=PAGE_SIZE):
+        self.noun = noun            # plural, for the footer ("creatures")
+        self.total = total          # number of entries, if known without generating them
+        self.page_size = page_size
+        self.shown = 0
+        self._entries = iter(entries)
+        self._next = None           # the entry after the last page, read to see if there is one
+
+    def next_page(self):
+        """(events for the next page of entries, whether there are more after it)"""
+        chunks = [] if self._next is None else [self._next]
+        chunks.extend(islice(self._entries, self.page_size - len(chunks)))
+        self._next = next(self._entries, None)
+        self.shown += len(chunks)
+        return [event for chunk in chunks for event in chunk], self._next is not None
+
+    def footer(self):
+        if self.total is not None:
+            return (f"[dim]Showing {self.shown} of {self.total} {self.noun}. "
+                    f"Type '[bold green]more[/bold green]' for the next page.[/dim]")
+        return f"[dim]Showing {self.shown} {self.noun} so far. Type '[bold green]more[/bold green]' for the next page.[/dim]"
+
+
+def parse_filter(argument, fields=None):
+    """Split a listing argument into (field filters, name filter).
+
+    "danger high" gives ({"danger_level": "high"}, "") when "danger" maps to
+    "danger_level" in `fields`; anything else is a lowercased name filter.
+    """
+    words = (argument or "").lower().split()
+    fields = fields or {}
+    if len(words) >= 2 and words[0] in fields:
+        return {fields[words[0]]: " ".join(words[1:])}, ""
+    return {}, " ".join(words)
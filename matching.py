@@ -0,0 +1,197 @@
+import os
+from bisect import bisect_left, insort
+
+# Queries shorter than this can't be looked up by trigram and fall back to an
+# ordered scan. Short substrings match almost everything, so the scan stops early.
+GRAM_SIZE = 3
+
+# Sorts after any character input can contain, so prefix + END_OF_PREFIX
+# bounds every string starting with prefix
+END_OF_PREFIX = "\U0010ffff"
+
+
+def normalize_key(key):
+    return key.replace("_", " ").lower()
+
+
+def trigrams(text):
+    return {text[i:i + GRAM_SIZE] for i in range(len(text) - GRAM_SIZE + 1)}
+
+
+class MatchIndex:
+    """Prebuilt name index over a data dict (quests, creatures, lore...).
+
+    Gives exactly the same first match as the old three-pass scan in
+    MythicScribeApp.find_match:
+      1. exact match on the lowercased name or the key with "_" as spaces
+      2. the input is a substring of the name or key
+      3. every input word is a substring of the name, or of the key
+    "First" means first in dict order, so every entry gets an ordinal that
+    follows the dict's insertion order.
+    """
+
+    def __init__(self, data_dict, name_field="name"):
+        self.data_dict = data_dict
+        self.name_field = name_field
+        self._keys = []          # ordinal -> key (None once removed)
+        self._texts = []         # ordinal -> (name_lower, key_lower)
+        self._ordinals = {}      # key -> ordinal
+        self._exact = {}         # normalized text -> sorted ordinals
+        self._grams = {}         # trigram -> sorted ordinals
+        for key, item in data_dict.items():
+            self.add(key, item)
+
+    def __len__(self):
+        return len(self._ordinals)
+
+    def add(self, key, item):
+        """Index a new entry, or re-index one whose name changed."""
+        texts = (item[self.name_field].lower(), normalize_key(key))
+        ordinal = self._ordinals.get(key)
+        if ordinal is None:
+            ordinal = len(self._keys)
+            self._ordinals[key] = ordinal
+            self._keys.append(key)
+            self._texts.append(texts)
+            append = True
+        else:
+            # Updating an existing key keeps its dict position, so keep the
+            # ordinal too. Old postings go stale and are filtered on lookup.
+            self._texts[ordinal] = texts
+            append = False
+
+        for text in set(texts):
+            self._post(self._exact, text, ordinal, append)
+        for gram in trigrams(texts[0]) | trigrams(texts[1]):
+            self._post(self._grams, gram, ordinal, append)
+
+    def remove(self, key):
+        ordinal = self._ordinals.pop(key, None)
+        if ordinal is not None:
+            self._keys[ordinal] = None
+            self._texts[ordinal] = None
+
+    def sync(self):
+        """Pick up keys added to or removed from the data dict directly.
+
+        Only the size is compared, so renames should go through add/remove.
+        """
+        if len(self._ordinals) == len(self.data_dict):
+            return
+        for key in [key for key in self._ordinals if key not in self.data_dict]:
+            self.remove(key)
+        for key, item in self.data_dict.items():
+            if key not in self._ordinals:
+                self.add(key, item)
+
+    def find(self, input_name):
+        """Return (key, item) for the best match, or (None, None)."""
+        input_name_lower = input_name.lower()
+
+        ordinal = self._first(self._exact.get(input_name_lower, ()),
+                              lambda name, key: input_name_lower == name or input_name_lower == key)
+        if ordinal is None:
+            ordinal = self._find_substring(input_name_lower)
+        if ordinal is None:
+            ordinal = self._find_words(input_name_lower.split())
+        if ordinal is None:
+            return None, None
+        key = self._keys[ordinal]
+        return key, self.data_dict[key]
+
+    def _find_substring(self, text):
+        def contains(name, key):
+            return text in name or text in key
+
+        if len(text) < GRAM_SIZE:
+            return self._first(range(len(self._keys)), contains)
+        return self._first(self._smallest_posting(trigrams(text)), contains)
+
+    def _find_words(self, words):
+        if not words:
+            return None
+
+        def all_words(name, key):
+            return all(word in name for word in words) or all(word in key for word in words)
+
+        # Each word must appear in the name or the key, so any one word's
+        # postings already hold every candidate. Walk the shortest list.
+        long_words = [word for word in words if len(word) >= GRAM_SIZE]
+        if not long_words:
+            return self._first(range(len(self._keys)), all_words)
+        postings = [self._smallest_posting(trigrams(word)) for word in long_words]
+        return self._first(min(postings, key=len), all_words)
+
+    def _smallest_posting(self, grams):
+        smallest = None
+        for gram in grams:
+            posting = self._grams.get(gram)
+            if not posting:
+                return ()
+            if smallest is None or len(posting) < len(smallest):
+                smallest = posting
+        return smallest or ()
+
+    def _first(self, ordinals, predicate):
+        # Postings are sorted, so the first live entry that passes the real
+        # check is the first match in dict order.
+        for ordinal in ordinals:
+            texts = self._texts[ordinal]
+            if texts is not None and predicate(*texts):
+                return ordinal
+        return None
+
+    @staticmethod
+    def _post(index, token, ordinal, append):
+        posting = index.setdefault(token, [])
+        if append:
+            posting.append(ordinal)
+            return
+        position = bisect_left(posting, ordinal)
+        if position == len(posting) or posting[position] != ordinal:
+            insort(posting, ordinal)
+
+
+class PrefixIndex:
+    """Sorted, unique strings with bisect lookups by prefix"""
+
+    def __init__(self, items=()):
+        self.items = sorted(set(items))
+
+    def __len__(self):
+        return len(self.items)
+
+    def __contains__(self, item):
+        position = bisect_left(self.items, item)
+        return position < len(self.items) and self.items[position] == item
+
+    def add(self, item):
+        if item not in self:
+            insort(self.items, item)
+
+    def remove(self, item):
+        position = bisect_left(self.items, item)
+        if position < len(self.items) and self.items[position] == item:
+            del self.items[position]
+
+    def range(self, prefix):
+        """(lo, hi) such that items[lo:hi] are the items starting with prefix"""
+        lo = bisect_left(self.items, prefix)
+        hi = bisect_left(self.items, prefix + END_OF_PREFIX, lo)
+        return lo, hi
+
+    def complete(self, prefix, limit=None):
+        """Items starting with prefix, in sorted order"""
+        lo, hi = self.range(prefix)
+        if limit is not None:
+            hi = min(hi, lo + limit)
+        return self.items[lo:hi]
+
+    def common_prefix(self, prefix):
+        """The longest string every item starting with prefix starts with,
+        or None if there are none"""
+        lo, hi = self.range(prefix)
+        if lo == hi:
+            return None
+        # In sorted order the first and last items differ the earliest
+        return os.path.commonprefix([self.items[lo], self.items[hi - 1]])
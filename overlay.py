@@ -0,0 +1,79 @@
+"""Copy-on-write views of shared content, one per game session.
+
+The server keeps a single read-only copy of the quests, creatures and
+lore. Each session wraps every collection in an Overlay, which looks like
+the plain {key: entry dict} the engine expects but stores only the fields
+that session has changed:
+
+    quests = Overlay(shared_quests)
+    quests["first_quest"]["status"] = "active"   # recorded in quests.changes
+    shared_quests["first_quest"]["status"]       # still "available"
+
+Entries are handed out as OverlayRecords, short-lived views that read
+through to the session's changes and then the shared entry, so holding one
+across a change made through another view is safe.
+"""
+from collections.abc import Mapping, MutableMapping
+
+
+class OverlayRecord(MutableMapping):
+    """One entry as a session sees it"""
+
+    __slots__ = ("_overlay", "_key", "_base")
+
+    def __init__(self, overlay, key, base):
+        self._overlay = overlay
+        self._key = key
+        self._base = base
+
+    def __getitem__(self, field):
+        changes = self._overlay.changes.get(self._key)
+        if changes is not None and field in changes:
+            return changes[field]
+        return self._base[field]
+
+    def __setitem__(self, field, value):
+        self._overlay.changes.setdefault(self._key, {})[field] = value
+
+    def __delitem__(self, field):
+        raise TypeError("content fields can't be removed from a session")
+
+    def __contains__(self, field):
+        changes = self._overlay.changes.get(self._key)
+        return field in self._base or (changes is not None and field in changes)
+
+    def get(self, field, default=None):
+        return self[field] if field in self else default
+
+    def __iter__(self):
+        yield from self._base
+        changes = self._overlay.changes.get(self._key, ())
+        yield from (field for field in changes if field not in self._base)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"OverlayRecord({dict(self)!r})"
+
+
+class Overlay(Mapping):
+    """A session's copy-on-write view of one content collection"""
+
+    __slots__ = ("base", "changes")
+
+    def __init__(self, base):
+        self.base = base
+        self.changes = {}    # key -> {field: value} this session has set
+
+    def __getitem__(self, key):
+        return OverlayRecord(self, key, self.base[key])
+
+    def __contains__(self, key):
+        return key in self.base
+
+    def __iter__(self):
+        return iter(self.base)
+
+    def __len__(self):
+        return len(self.base)
@@ -0,0 +1,132 @@
+"""Save games as a snapshot plus an append-only journal.
+
+Both files are line-delimited JSON. The first line is a header naming the
+format and version; every other line is one state change,
+
+    ["quests", "first_quest", "status", "active"]
+    ["player", null, "gold", 150]
+
+in the form GameEngine.set_state() takes. A change always carries the new
+value rather than a delta, so replaying a line twice is harmless.
+
+The snapshot holds the full saved state as of the last compaction and the
+journal holds every change since. Autosaving appends only the changes the
+last command made, and a crash loses at most the command in flight.
+Compaction rewrites the snapshot from the current state and empties the
+journal; it runs once the journal is long enough.
+"""
+import json
+import os
+
+from line_files import header_line, open_append, read_header, rewrite
+
+FORMAT = "mythic-scribe-save"
+VERSION = 1
+
+# The content fields that change during play and are worth saving
+SAVED_FIELDS = {
+    "quests": ("status",),
+    "creatures": ("documented",),
+    "lore": ("discovered",),
+}
+
+
+def _header(kind):
+    return header_line(format=FORMAT, version=VERSION, kind=kind)
+
+
+def snapshot_changes(engine):
+    """Every saved piece of the engine's state, as set_state() arguments"""
+    for field, value in engine.player_state.items():
+        yield "player", None, field, value
+    for collection, fields in SAVED_FIELDS.items():
+        for key, item in getattr(engine, collection).items():
+            for field in fields:
+                if field in item:
+                    yield collection, key, field, item[field]
+
+
+class SaveGame:
+    """Snapshot at `path`, journal at `path + ".journal"`"""
+
+    def __init__(self, path, compact_after=1000, fsync=False):
+        self.path = path
+        self.journal_path = path + ".journal"
+        self.compact_after = compact_after
+        self.fsync = fsync
+        self._journal = None
+        self.journal_length = 0
+
+    def load(self, engine):
+        """Apply the snapshot and then the journal to `engine`.
+
+        Changes naming entries the content no longer has are skipped.
+        Returns the number of changes applied.
+        """
+        applied = self._replay(self.path, "snapshot", engine)
+        journal_applied = self._replay(self.journal_path, "journal", engine)
+        self.journal_length = journal_applied
+        return applied + journal_applied
+
+    def _replay(self, path, kind, engine):
+        try:
+            f = open(path, encoding="utf-8")
+        except FileNotFoundError:
+            return 0
+        applied = 0
+        with f:
+            read_header(f, path, f"save {kind}", FORMAT, VERSION, kind=kind)
+            for line in f:
+                try:
+                    collection, key, field, value = json.loads(line)
+                except ValueError:
+                    # A line torn by a crash mid-write
+                    continue
+                try:
+                    engine.apply_change(collection, key, field, value)
+                except KeyError:
+                    continue
+                applied += 1
+        return applied
+
+    def attach(self, engine):
+        """Start recording the engine's changes for autosave()"""
+        engine.record_changes = True
+        engine.take_changes()
+
+    def autosave(self, engine):
+        """Append the changes made since the last call to the journal"""
+        changes = engine.take_changes()
+        if not changes:
+            return 0
+        journal = self._open_journal()
+        journal.write("".join(json.dumps(change, separators=(",", ":")) + "\n" for change in changes))
+        journal.flush()
+        if self.fsync:
+            os.fsync(journal.fileno())
+        self.journal_length += len(changes)
+        if self.journal_length >= self.compact_after:
+            self.compact(engine)
+        return len(changes)
+
+    def _open_journal(self):
+        if self._journal is None:
+            self._journal = open_append(self.journal_path, _header("journal"))
+        return self._journal
+
+    def compact(self, engine):
+        """Write a fresh snapshot of the whole state and empty the journal"""
+        rewrite(self.path, _header("snapshot"),
+                (json.dumps(change, separators=(",", ":")) + "\n" for change in snapshot_changes(engine)),
+                fsync=True)
+        # If we die between these two steps the old journal is replayed over
+        # the new snapshot, which is harmless since changes are absolute.
+        self.close()
+        with open(self.journal_path, "w", encoding="utf-8") as f:
+            f.write(_header("journal"))
+        self.journal_length = 0
+
+    def close(self):
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
@@ -0,0 +1,205 @@
+"""Opt-in timing of the command hot path.
+
+    profiler = Profiler()
+    profiler.instrument(engine)
+    engine.execute("look")
+    profiler.report()   # {"commands": {"look": {"total": {...}, ...}}, "counters": {...}}
+
+instrument() shadows the engine's execute, parse, find_match and
+apply_change with timing wrappers on that one instance. An engine that
+was never instrumented runs the plain methods and pays nothing, so this
+can stay in production builds.
+
+Each command's time is split into phases:
+  parse       finding the command for the input line
+  find_match  looking up the quest, creature or place the player named
+  state       set_state()/apply_change() calls
+  render      turning the output events into log lines (the app reports this)
+  total       all of execute(), which includes every phase but render
+and every phase gets a latency histogram per command.
+
+Set MYTHIC_SCRIBE_PROFILE (or pass --profile) to a file name to turn
+instrumentation on and write a report on exit: a cProfile dump if the name
+ends in ".prof", the JSON from report() otherwise.
+"""
+import json
+import os
+import time
+
+ENV_VAR = "MYTHIC_SCRIBE_PROFILE"
+
+PHASES = ("parse", "find_match", "state", "render", "total")
+
+# Histogram buckets are powers of two in microseconds; the last one holds everything over about 18 minutes
+BUCKETS = 32
+
+
+class Histogram:
+    """Latencies counted in power-of-two microsecond buckets"""
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds):
+        # Bucket i holds [2 ** (i - 1), 2 ** i) microseconds, bucket 0 under 1us
+        self.counts[min(int(seconds * 1e6).bit_length(), BUCKETS - 1)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, fraction):
+        """Upper bound of the bucket holding the given fraction of samples, in seconds"""
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        seen = 0
+        for bucket, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(2 ** bucket / 1e6, self.max)
+        return self.max
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "total_ms": self.total * 1000,
+            "mean_ms": self.total / self.count * 1000 if self.count else 0.0,
+            "p50_ms": self.percentile(0.5) * 1000,
+            "p99_ms": self.percentile(0.99) * 1000,
+            "max_ms": self.max * 1000,
+            # Upper bound in microseconds -> count, for the buckets in use
+            "buckets_us": {2 ** bucket: count for bucket, count in enumerate(self.counts) if count},
+        }
+
+
+class Profiler:
+    """Per-command phase histograms and counters for one or more engines"""
+
+    def __init__(self, path=None):
+        # Where close() writes the report, if anywhere
+        self.path = path
+        self.histograms = {}    # command name -> {phase: Histogram}
+        self.counters = {}      # name -> count, see count()
+        self.sources = {}       # name -> callable returning {counter: value}, read by report()
+        self.command = None     # name of the command in flight, or the last one run
+        self._phases = None     # phase -> seconds so far for the command in flight
+        self._cprofile = None
+        if path is not None and path.endswith(".prof"):
+            import cProfile
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+
+    @classmethod
+    def from_environment(cls, path=None):
+        """A Profiler writing to `path` or $MYTHIC_SCRIBE_PROFILE, or None if neither is set"""
+        path = path or os.environ.get(ENV_VAR)
+        return cls(path) if path else None
+
+    def instrument(self, engine):
+        engine.profiler = self
+        engine.execute = self._timed_command(engine.execute)
+        engine.parse = self._timed_parse(engine.parse)
+        engine.find_match = self._timed("find_match", engine.find_match)
+        engine.apply_change = self._timed("state", engine.apply_change)
+        return engine
+
+    def _timed_command(self, execute):
+        def timed_execute(command):
+            self._phases = {}
+            self.command = None
+            start = time.perf_counter()
+            try:
+                return execute(command)
+            finally:
+                phases, self._phases = self._phases, None
+                phases["total"] = time.perf_counter() - start
+                for phase, seconds in phases.items():
+                    self.record(phase, seconds)
+        return timed_execute
+
+    def _timed_parse(self, parse):
+        def timed_parse(line):
+            start = time.perf_counter()
+            command, argument = parse(line)
+            self._add("parse", time.perf_counter() - start)
+            self.command = command.name if command is not None else "(unknown)"
+            return command, argument
+        return timed_parse
+
+    def _timed(self, phase, method):
+        def timed(*args):
+            start = time.perf_counter()
+            try:
+                return method(*args)
+            finally:
+                self._add(phase, time.perf_counter() - start)
+        return timed
+
+    def _add(self, phase, seconds):
+        # Calls outside a command (e.g. loading a save) aren't part of any command's latency
+        if self._phases is not None:
+            self._phases[phase] = self._phases.get(phase, 0.0) + seconds
+
+    def record(self, phase, seconds, command=None):
+        """Add one sample for a phase of `command` (by default the last one run)"""
+        command = command or self.command or "(unknown)"
+        phases = self.histograms.get(command)
+        if phases is None:
+            phases = self.histograms[command] = {}
+        histogram = phases.get(phase)
+        if histogram is None:
+            histogram = phases[phase] = Histogram()
+        histogram.record(seconds)
+
+    def count(self, name, amount=1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def add_source(self, name, read):
+        """Include `read()`, a dict of counters kept elsewhere, in the report"""
+        self.sources[name] = read
+
+    def report(self):
+        counters = dict(self.counters)
+        for name, read in self.sources.items():
+            for counter, value in read().items():
+                counters[f"{name} {counter}"] = value
+        return {
+            "commands": {command: {phase: phases[phase].to_dict() for phase in PHASES if phase in phases}
+                         for command, phases in self.histograms.items()},
+            "counters": counters,
+        }
+
+    def stats_lines(self):
+        """The report as markup lines, for the `stats` command"""
+        report = self.report()
+        lines = [f"{'command':<20}{'phase':<12}{'count':>7}{'p50 ms':>9}{'p99 ms':>9}{'max ms':>9}"]
+        busiest = sorted(report["commands"].items(), key=lambda item: item[1]["total"]["total_ms"]
+                         if "total" in item[1] else 0.0, reverse=True)
+        for command, phases in busiest:
+            for phase, row in phases.items():
+                lines.append(f"{command:<20}{phase:<12}{row['count']:>7}{row['p50_ms']:>9.3f}"
+                             f"{row['p99_ms']:>9.3f}{row['max_ms']:>9.3f}")
+                command = ""
+        for name, value in report["counters"].items():
+            lines.append(f"{name}: [bold]{value}[/bold]")
+        return lines
+
+    def close(self):
+        """Stop profiling and write the report to `path`, if one was given"""
+        if self.path is None:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        if self._cprofile is not None:
+            self._cprofile.disable()
+            self._cprofile.dump_stats(self.path)
+        else:
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump(self.report(), f, indent=2)
+                f.write("\n")
+        self.path = None
@@ -0,0 +1,231 @@
+"""Declarative quest conditions, evaluated incrementally.
+
+Quests in data/quests.py describe what they need instead of the engine
+hard-coding it:
+
+    "prerequisites": {"complete": ["first_quest"]},      # before it can be taken
+    "conditions": {"document": ["goblin", "dire_wolf"]},  # before it can be completed
+    "location": "whispering_woods",                       # where the work happens
+    "hints": [{"location": "whispering_woods", "status": "active",
+               "unmet": {"document": "goblin"}, "text": "..."}],
+
+A condition is a (kind, key) pair: "document" a creature, "discover" a
+lore entry or "complete" another quest. QuestIndex indexes every condition
+by the entry it watches, so a state change only re-checks the conditions
+that mention that entry. Readiness and hints are then O(1) lookups per
+quest instead of a re-check of every quest on every command. QuestRules
+keeps one player's unmet conditions on top of a QuestIndex that engines
+over the same quests can share.
+"""
+from collections import namedtuple
+
+# kind -> (collection, field, value that satisfies it)
+CONDITION_KINDS = {
+    "document": ("creatures", "documented", True),
+    "discover": ("lore", "discovered", True),
+    "complete": ("quests", "status", "completed"),
+}
+
+Reward = namedtuple("Reward", ["gold", "items", "text"])
+
+
+def parse_reward(reward):
+    """Turn a quest's reward into a Reward.
+
+    Accepts the text form used in data ("50 gold", "20 gold, Silver Quill",
+    "75 gold pieces") or a dict ({"gold": 50, "items": ["Silver Quill"]}).
+    """
+    if isinstance(reward, dict):
+        gold = int(reward.get("gold", 0))
+        items = tuple(reward.get("items", ()))
+        parts = ([f"{gold} gold"] if gold else []) + list(items)
+        return Reward(gold, items, reward.get("text", ", ".join(parts)))
+
+    gold = 0
+    items = []
+    for part in (reward or "").split(","):
+        part = part.strip()
+        words = part.split()
+        if len(words) > 1 and words[0].isdigit() and words[1].lower() == "gold":
+            gold += int(words[0])
+        elif part:
+            items.append(part)
+    return Reward(gold, tuple(items), reward or "")
+
+
+def _conditions(spec):
+    """Flatten {"document": ["goblin"], ...} into [("document", "goblin"), ...]"""
+    conditions = []
+    for kind, keys in (spec or {}).items():
+        if kind not in CONDITION_KINDS:
+            raise ValueError(f"unknown quest condition {kind!r}")
+        if isinstance(keys, str):
+            keys = [keys]
+        conditions.extend((kind, key) for key in keys)
+    return conditions
+
+
+class QuestIndex:
+    """What the quest rules know from the quest definitions alone: rewards,
+    conditions, hints and which quests watch which entries.
+
+    It doesn't depend on anyone's progress, so engines over the same
+    quests (e.g. server sessions) can share one.
+    """
+
+    def __init__(self, quests):
+        self.rewards = {}           # quest key -> Reward
+        self.conditions = {}        # quest key -> completion conditions, in data order
+        self.prerequisites = {}     # quest key -> conditions for taking it
+        self.watchers = {}          # (collection, entry key) -> [(quest key, condition, is prerequisite)]
+        self.hints = {}             # location -> [(quest key, hint)]
+        self.located = {}           # location -> keys of the quests set there
+        self._watched_by = {}       # quest key -> the (collection, entry key)s it watches
+        self._quest_hints = {}      # quest key -> its hints, so they can be removed again
+        self._location_of = {}      # quest key -> its location, so it can be removed from that one list
+        for key, quest in quests.items():
+            self.add_quest(key, quest)
+
+    def add_quest(self, quest_key, quest):
+        """Index one quest's reward, conditions and hints (again, if it changed)"""
+        self.remove_quest(quest_key)
+        self.rewards[quest_key] = parse_reward(quest.get("reward"))
+
+        watched = self._watched_by[quest_key] = []
+        for attribute, spec, is_prerequisite in ((self.conditions, quest.get("conditions"), False),
+                                                 (self.prerequisites, quest.get("prerequisites"), True)):
+            conditions = attribute[quest_key] = _conditions(spec)
+            for condition in conditions:
+                entry = (CONDITION_KINDS[condition[0]][0], condition[1])
+                self.watchers.setdefault(entry, []).append((quest_key, condition, is_prerequisite))
+                watched.append(entry)
+
+        if "location" in quest:
+            self._location_of[quest_key] = quest["location"]
+            self.located.setdefault(quest["location"], []).append(quest_key)
+        hints = quest.get("hints", ())
+        self._quest_hints[quest_key] = hints
+        for hint in hints:
+            self.hints.setdefault(hint["location"], []).append((quest_key, hint))
+
+    def remove_quest(self, quest_key):
+        if quest_key not in self.rewards:
+            return
+        del self.rewards[quest_key]
+        del self.conditions[quest_key]
+        del self.prerequisites[quest_key]
+        for entry in set(self._watched_by.pop(quest_key, ())):
+            watchers = self.watchers[entry]
+            watchers[:] = [watcher for watcher in watchers if watcher[0] != quest_key]
+        for hint in self._quest_hints.pop(quest_key, ()):
+            location_hints = self.hints.get(hint["location"], [])
+            location_hints[:] = [entry for entry in location_hints if entry[0] != quest_key]
+        if quest_key in self._location_of:
+            self.located[self._location_of.pop(quest_key)].remove(quest_key)
+
+
+class QuestRules:
+    """One player's view of the quest rules.
+
+    The static part is a QuestIndex, built here or passed in to share it.
+    The unmet conditions of a quest are worked out the first time they are
+    asked for and then kept up to date by on_change(), so an engine only
+    holds state for the quests its player has looked at.
+    """
+
+    def __init__(self, quests, creatures, lore, index=None):
+        self.collections = {"quests": quests, "creatures": creatures, "lore": lore}
+        self.index = index if index is not None else QuestIndex(quests)
+        self.rewards = self.index.rewards
+        self._unmet = {}            # quest key -> (unmet conditions, unmet prerequisites)
+
+    def satisfied(self, condition):
+        kind, key = condition
+        collection, field, value = CONDITION_KINDS[kind]
+        entry = self.collections[collection].get(key)
+        return entry is not None and entry.get(field) == value
+
+    def _state(self, quest_key):
+        state = self._unmet.get(quest_key)
+        if state is None:
+            state = self._unmet[quest_key] = (
+                {condition for condition in self.index.conditions.get(quest_key, ()) if not self.satisfied(condition)},
+                {condition for condition in self.index.prerequisites.get(quest_key, ()) if not self.satisfied(condition)},
+            )
+        return state
+
+    def unmet(self, quest_key):
+        """The quest's completion conditions that aren't met yet"""
+        return self._state(quest_key)[0]
+
+    def add_quest(self, quest_key, quest):
+        """Re-index a quest whose definition changed"""
+        self.index.add_quest(quest_key, quest)
+        self._unmet.pop(quest_key, None)
+
+    def remove_quest(self, quest_key):
+        self.index.remove_quest(quest_key)
+        self._unmet.pop(quest_key, None)
+
+    def on_change(self, collection, key, field):
+        """Re-check only the conditions that watch the entry that changed"""
+        for quest_key, condition, is_prerequisite in self.index.watchers.get((collection, key), ()):
+            if CONDITION_KINDS[condition[0]][1] != field:
+                continue
+            state = self._unmet.get(quest_key)
+            if state is None:
+                # Not worked out yet, and it will be from the current state
+                continue
+            unmet = state[1] if is_prerequisite else state[0]
+            if self.satisfied(condition):
+                unmet.discard(condition)
+            else:
+                unmet.add(condition)
+
+    def is_ready(self, quest_key):
+        """True when every completion condition of the quest is met"""
+        return not self.unmet(quest_key)
+
+    def can_take(self, quest_key):
+        return not self._state(quest_key)[1]
+
+    def blocked_message(self, quest_key, quest_name):
+        kinds = {kind for kind, _ in self.unmet(quest_key)}
+        if kinds == {"document"}:
+            return f"You must document all creatures for '{quest_name}' before completing it."
+        if kinds == {"discover"}:
+            return f"You must discover all lore for '{quest_name}' before completing it."
+        return f"You must finish everything '{quest_name}' asks before completing it."
+
+    def hints_for(self, location_key):
+        """Hint texts for a location, in data order, given the current quest state"""
+        quests = self.collections["quests"]
+        texts = []
+        for quest_key, hint in self.index.hints.get(location_key, ()):
+            quest = quests.get(quest_key)
+            if quest is None or ("status" in hint and quest["status"] != hint["status"]):
+                continue
+            if "unmet" in hint and not self.unmet(quest_key).intersection(_conditions(hint["unmet"])):
+                continue
+            if "ready" in hint and self.is_ready(quest_key) != hint["ready"]:
+                continue
+            texts.append(hint["text"])
+        return texts
+
+    def next_unmet(self, location_key, kind):
+        """The first unmet `kind` condition of the active quests set at a location.
+
+        Returns (whether any quest there is active, entry key or None).
+        """
+        quests = self.collections["quests"]
+        active_here = False
+        for quest_key in self.index.located.get(location_key, ()):
+            quest = quests.get(quest_key)
+            if quest is None or quest["status"] != "active":
+                continue
+            active_here = True
+            unmet = self.unmet(quest_key)
+            for condition in self.index.conditions[quest_key]:
+                if condition[0] == kind and condition in unmet:
+                    return True, condition[1]
+        return active_here, None
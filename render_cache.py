@@ -0,0 +1,95 @@
+from collections import OrderedDict
+
+from rich.measure import Measurement, measure_renderables
+from rich.segment import Segment
+
+
+class Prerendered:
+    """Segments rendered earlier at a fixed width, replayed as-is.
+
+    Measuring and rendering one of these costs a list walk, so the game
+    log can write it again without re-laying-out panels and columns.
+    """
+
+    def __init__(self, lines, width):
+        self.lines = lines
+        self.width = width
+
+    def __rich_measure__(self, console, options):
+        return Measurement(self.width, self.width)
+
+    def __rich_console__(self, console, options):
+        new_line = Segment.line()
+        for line in self.lines:
+            yield from line
+            yield new_line
+
+
+class CachedRender:
+    """A keyed event as written to the game log: rendered through a
+    RenderCache at whatever width the log is laid out at, so it is laid
+    out again, rather than cropped, when the log is reflowed.
+    """
+
+    def __init__(self, cache, key, build, console, min_width=0):
+        self.cache = cache
+        self.key = key
+        self.build = build
+        self.console = console
+        self.min_width = min_width
+
+    def at_width(self, width):
+        return self.cache.get(self.key, self.build, self.console, width, self.min_width)
+
+
+class RenderCache:
+    """Bounded LRU cache of Prerendered renderables.
+
+    Keys come from the engine's OutputEvents, e.g. ("location",
+    location_key, state_version), and already change whenever the state
+    behind the output changes. The available width is added to the key
+    here, so a resize simply misses.
+    """
+
+    def __init__(self, max_size=256):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, build, console, width, min_width=0):
+        """Return the cached renderable for key at width, building it on a miss"""
+        cache_key = (key, width, min_width)
+        cached = self._entries.get(cache_key)
+        if cached is not None:
+            self.hits += 1
+            self._entries.move_to_end(cache_key)
+            return cached
+
+        self.misses += 1
+        renderable = build()
+        # Same width rules GameLog.write (and RichLog.write) use
+        render_width = measure_renderables(console, console.options, [renderable]).maximum
+        render_width = max(min(render_width, width), min_width)
+        lines = console.render_lines(renderable, console.options.update_width(render_width), pad=False)
+        cached = Prerendered(lines, render_width)
+
+        self._entries[cache_key] = cached
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+        return cached
+
+    def discard(self, keys):
+        """Drop what was cached for any of these event keys, at every width"""
+        keys = set(keys)
+        for cache_key in [cache_key for cache_key in self._entries if cache_key[0] in keys]:
+            del self._entries[cache_key]
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self):
+        return {"size": len(self._entries), "max_size": self.max_size, "hits": self.hits, "misses": self.misses}
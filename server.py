@@ -0,0 +1,163 @@
+"""Host many Mythic Scribe players from one process over TCP.
+
+    python server.py [--host 127.0.0.1] [--port 4000] [--content FILE]
+
+The protocol is plain lines, so `nc localhost 4000` is a client. Every line
+sent is one command. Every response (including the welcome on connect) is
+the game output as markup lines, ended by a line holding a single ".".
+Output lines that start with "." get a second one, as in SMTP. The
+connection closes after "quit".
+
+Content is loaded once and shared read-only. Each session gets its own
+GameEngine over Overlay views of it (see overlay.py), so a session costs
+its player state and the fields it has changed, not a copy of the content.
+The world graph, find_match indexes, quest index and command registry are
+shared too.
+"""
+import argparse
+import asyncio
+import sys
+
+from content_packs import ContentPacks
+from engine import GameEngine
+from headless import event_lines
+from overlay import Overlay
+from profiling import Profiler
+from quest_rules import QuestIndex
+from world import WorldGraph
+
+# Longest command line accepted; longer lines end the session
+MAX_LINE = 1024
+
+
+class SharedContent:
+    """The read-only content every session plays over"""
+
+    def __init__(self, quests, creatures, lore, locations):
+        self.quests = quests
+        self.creatures = creatures
+        self.lore = lore
+        self.locations = locations
+        self.world = WorldGraph(locations)
+        self.match_indexes = {}
+        self.command_registry = GameEngine.build_command_registry()
+        self.quest_index = QuestIndex(quests)
+
+    @classmethod
+    def load(cls, path=None, compact=False, packs=None):
+        """Content from a content store file, or from data/*.py, with the
+        content_packs.ContentPacks `packs` applied over it. With `compact`,
+        quests, creatures and lore go into EntityTables."""
+        from content_snapshot import load_content
+        if path:
+            from content_store import ContentStore
+            content = ContentStore(path).load_all()
+            if not content["locations"]:
+                content["locations"] = load_content()[0]["locations"]
+        else:
+            content, _ = load_content()
+        if packs is not None:
+            packs.load(content)
+        if compact:
+            from entity_store import compact_content
+            content = compact_content(content)
+        return cls(content["quests"], content["creatures"], content["lore"], content["locations"])
+
+    def new_engine(self):
+        return GameEngine(Overlay(self.quests), Overlay(self.creatures), Overlay(self.lore), self.locations,
+                          world=self.world, match_indexes=self.match_indexes,
+                          command_registry=self.command_registry, quest_index=self.quest_index)
+
+
+def response_bytes(events):
+    lines = []
+    for event in events:
+        for line in event_lines(event):
+            for part in line.split("\n"):
+                lines.append("." + part if part.startswith(".") else part)
+    lines.append(".\n")
+    return "\n".join(lines).encode("utf-8")
+
+
+class GameServer:
+    def __init__(self, content, profiler=None):
+        self.content = content
+        # One profiling.Profiler shared by every session, if instrumentation is on
+        self.profiler = profiler
+        self.sessions = 0           # currently connected
+        self.total_sessions = 0
+        self.commands = 0
+        if profiler is not None:
+            profiler.add_source("server", lambda: {"sessions": self.sessions, "total sessions": self.total_sessions,
+                                                   "commands": self.commands})
+
+    async def handle(self, reader, writer):
+        engine = self.content.new_engine()
+        if self.profiler is not None:
+            self.profiler.instrument(engine)
+        self.sessions += 1
+        self.total_sessions += 1
+        try:
+            writer.write(response_bytes(engine.welcome()))
+            await writer.drain()
+            while engine.running:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # Over MAX_LINE
+                    break
+                if not line:
+                    break
+                writer.write(response_bytes(engine.execute(line.decode("utf-8", "replace"))))
+                self.commands += 1
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.sessions -= 1
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+
+async def serve(content, host, port, profiler=None):
+    game_server = GameServer(content, profiler)
+    listener = await asyncio.start_server(game_server.handle, host, port, limit=MAX_LINE, backlog=1024)
+    host, port = listener.sockets[0].getsockname()[:2]
+    # benchmarks/bench_server.py reads the port from this line
+    print(f"Mythic Scribe server listening on {host}:{port}", flush=True)
+    async with listener:
+        await listener.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve Mythic Scribe to many players over TCP.")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on")
+    parser.add_argument("--port", type=int, default=4000, help="port to listen on (0 picks a free one)")
+    parser.add_argument("--content", help="load content from a content store file instead of data/*.py")
+    parser.add_argument("--compact", action="store_true", help="keep quests, creatures and lore in compact column tables (for large bestiaries)")
+    parser.add_argument("--pack", action="append", default=[],
+                        help="apply the content pack in this directory (repeatable; later packs win)")
+    parser.add_argument("--profile", help="time every command and write a report here on exit "
+                                          "(a cProfile dump if it ends in .prof, JSON otherwise)")
+    args = parser.parse_args(argv)
+
+    profiler = Profiler.from_environment(args.profile)
+    packs = ContentPacks(args.pack) if args.pack else None
+    try:
+        shared = SharedContent.load(args.content, args.compact, packs)
+        for error in packs.errors if packs is not None else ():
+            print(error, file=sys.stderr)
+        asyncio.run(serve(shared, args.host, args.port, profiler))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if profiler is not None:
+            profiler.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+from collections import OrderedDict, deque
+
+
+class WorldGraph:
+    """Locations and their exits, loaded from data (see data/locations.py).
+
+    Each location's "exits" maps the phrases a player can type after "go"
+    to a destination key. `go` picks the first phrase, in data order, that
+    contains what was typed. Those lookups are precomputed per location the
+    first time it is used, and shortest paths are cached per starting
+    location.
+    """
+
+    def __init__(self, locations, path_cache_size=64):
+        self.locations = locations
+        self.path_cache_size = path_cache_size
+        self._exit_lookups = {}
+        self._path_trees = OrderedDict()
+
+    def invalidate(self, location_key=None):
+        """Forget cached lookups after locations or exits change"""
+        if location_key is None:
+            self._exit_lookups.clear()
+        else:
+            self._exit_lookups.pop(location_key, None)
+        self._path_trees.clear()
+
+    def exits(self, location_key):
+        location = self.locations.get(location_key)
+        return location["exits"] if location is not None else {}
+
+    def neighbours(self, location_key):
+        return list(dict.fromkeys(self.exits(location_key).values()))
+
+    def resolve_exit(self, location_key, destination):
+        """Return the location that `go <destination>` leads to, or None"""
+        lookup = self._exit_lookups.get(location_key)
+        if lookup is None:
+            lookup = self._build_exit_lookup(location_key)
+        return lookup.get(destination.lower())
+
+    def _build_exit_lookup(self, location_key):
+        # Every substring of every phrase, mapped to the first phrase's
+        # destination, turns "first phrase containing the input" into one
+        # dict lookup. Exit phrases are short, so this stays small.
+        lookup = {}
+        for phrase, target in self.exits(location_key).items():
+            phrase = phrase.lower()
+            for start in range(len(phrase)):
+                for end in range(start + 1, len(phrase) + 1):
+                    lookup.setdefault(phrase[start:end], target)
+        self._exit_lookups[location_key] = lookup
+        return lookup
+
+    def shortest_path(self, source, target):
+        """Locations from source to target (both included), or None if unreachable"""
+        if source == target:
+            return [source]
+        parents = self._path_tree(source)
+        if target not in parents:
+            return None
+        path = [target]
+        while path[-1] != source:
+            path.append(parents[path[-1]])
+        path.reverse()
+        return path
+
+    def _path_tree(self, source):
+        # One breadth-first search from a location answers the shortest
+        # path to every other location, so the whole tree is cached.
+        parents = self._path_trees.get(source)
+        if parents is not None:
+            self._path_trees.move_to_end(source)
+            return parents
+        parents = {source: None}
+        queue = deque([source])
+        while queue:
+            current = queue.popleft()
+            for neighbour in self.exits(current).values():
+                if neighbour not in parents:
+                    parents[neighbour] = current
+                    queue.append(neighbour)
+        self._path_trees[source] = parents
+        if len(self._path_trees) > self.path_cache_size:
+            self._path_trees.popitem(last=False)
+        return parents